@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: async_tracker.py - asyncio-native session capacity tracker
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: minimal_tracker.py
+IMPORTED_BY: None
+
+TABLE_OF_CONTENTS:
+1. AsyncMinimalTracker Class - Awaitable wrapper around a MinimalTracker
+2. Non-blocking Persistence - Writes run in an executor, off the event loop
+3. Save Coalescing - Saves requested during a write share the next write
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+"""
+
+import asyncio
+import functools
+
+from minimal_tracker import MinimalTracker
+
+
+class AsyncMinimalTracker:
+    """Awaitable tracker API that never blocks the event loop on file I/O"""
+
+    def __init__(self, tracker=None, executor=None, silent=True):
+        """
+        Wrap a tracker for use from asyncio code
+
+        Args:
+            tracker (MinimalTracker): Tracker to wrap (a new one if omitted)
+            executor (Executor): Executor for metrics writes (loop default if omitted)
+            silent (bool): Silent mode for a newly created tracker
+        """
+        self.tracker = tracker or MinimalTracker(silent=silent)
+        self.executor = executor
+        self._writer = None
+        self._queued = None
+
+    async def register(self, op_type, complexity=None, size=None):
+        """Register operation (in-memory only, runs on the loop)"""
+        return self.tracker.register(op_type, complexity, size)
+
+    async def register_many(self, op_types, complexities=None, sizes=None):
+        """Register a batch of operations"""
+        return self.tracker.register_many(op_types, complexities, sizes)
+
+    async def estimate(self, task, complexity="medium", size="medium"):
+        """Estimate operation cost with decision support"""
+        return self.tracker.estimate(task, complexity, size)
+
+    async def check(self):
+        """Explicit status check"""
+        return self.tracker.check()
+
+    async def save_metrics(self):
+        """
+        Persist metrics without blocking the event loop
+
+        Callers arriving while a write is in flight share a single
+        follow-up write that snapshots state after their call.
+
+        Returns:
+            dict: save_metrics() result of the write covering this call
+        """
+        loop = asyncio.get_running_loop()
+        if self._queued is None:
+            self._queued = loop.create_future()
+        future = self._queued
+
+        if self._writer is None:
+            self._queued = None
+            self._writer = loop.create_task(self._write_loop(future))
+            self._writer.add_done_callback(functools.partial(self._writer_done, future))
+        return await asyncio.shield(future)
+
+    async def prepare_hop(self):
+        """Prepare for session hop, awaiting the metrics write"""
+        metrics = self.tracker._hop_metrics()
+        await self.save_metrics()
+        return metrics
+
+    async def aclose(self):
+        """Wait for any in-flight or queued write to finish"""
+        while self._writer is not None:
+            await asyncio.shield(self._writer)
+
+    async def _write_loop(self, future):
+        """Serve queued saves one write at a time"""
+        loop = asyncio.get_running_loop()
+        try:
+            while future is not None:
+                # Snapshot on the loop thread so register() never races the writer
+                record = self.tracker._session_record()
+                try:
+                    result = await loop.run_in_executor(self.executor, self.tracker._write_record, record)
+                except Exception as e:
+                    result = {"status": "error", "message": str(e)}
+                future.set_result(result)
+                future, self._queued = self._queued, None
+        except BaseException as e:
+            # Fail every coalesced caller rather than leave them waiting
+            waiting, self._queued = (future, self._queued), None
+            self._fail_waiting(waiting, e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self._writer = None
+
+    def _writer_done(self, future, task):
+        """A writer cancelled before it ran never reached its handler: fail its callers"""
+        if self._writer is not task:
+            return
+        self._writer = None
+        waiting, self._queued = (future, self._queued), None
+        self._fail_waiting(waiting, asyncio.CancelledError())
+
+    @staticmethod
+    def _fail_waiting(waiting, error):
+        """Resolve unfinished save futures with an error (cancelled for cancellation)"""
+        for pending in waiting:
+            if pending is not None and not pending.done():
+                if isinstance(error, asyncio.CancelledError):
+                    pending.cancel()
+                else:
+                    pending.set_exception(error)
+
+
+# Example usage
+if __name__ == "__main__":
+    async def main():
+        tracker = AsyncMinimalTracker(silent=False)
+        await tracker.register("context", size=80)
+        await tracker.register("code", "high", "large")
+
+        # Concurrent saves coalesce into at most two writes
+        results = await asyncio.gather(*(tracker.save_metrics() for _ in range(5)))
+        print(results[-1])
+
+        hop = await tracker.prepare_hop()
+        print(f"Session wrap-up: {hop['usage']}% used, {hop['recommendation']}")
+        await tracker.aclose()
+
+    asyncio.run(main())
@@ -1,32 +1,56 @@
 #!/usr/bin/env python3
 """
 FILE_OVERVIEW: auto_init.py - TeamBadass Auto-Initialization System
-VERSION: 1.0.0
-LAST_UPDATED: 2025-05-01
-DEPENDENCIES: None
+VERSION: 1.4.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: startup_profiler.py, repo_fingerprint.py, memory_snapshot.py (imported lazily)
 IMPORTED_BY: init.py, session_start.py
 
 TABLE_OF_CONTENTS:
 1. Repository Detection - Methods to detect GitHub repository presence
 2. Gas Gauge Initialization - Streamlined startup with minimal output
 3. Mobile Optimization - Special handling for mobile devices
+4. Repository Fingerprint - Cached Merkle digest of teambadass/ (cache key)
+5. Memory Loading - Concurrent read/parse with an in-process parsed cache
+6. Warm Start - mmapped snapshot of parsed memory, rebuilt on fingerprint change
+7. Startup Profiling - Per-phase timings (GAS_PROFILE_STARTUP=1)
 
 SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
 """
 
 import os
+import glob
 import json
 import time
 import logging
+import importlib
+import threading
 from datetime import datetime
 
-# Configure minimal logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s'  # Simplified format for mobile
-)
+from startup_profiler import PROFILER
+
+# Heavier helpers (hashlib/OpenSSL, mmap, thread pools) are imported where
+# they are first needed so importing this module stays cheap
 logger = logging.getLogger("TeamBadass")
 
+# Gauge implementations, preferred first: name -> (module, class, source file)
+GAUGE_IMPLEMENTATIONS = [
+    ("observable", "teambadass._memory.gas_gauge.observable_gas_gauge", "ObservableGasGauge",
+     "teambadass/_memory/gas_gauge/observable_gas_gauge.py"),
+    ("core", "teambadass._memory.gas_gauge.gas_gauge_core", "ClaudeGasGauge",
+     "teambadass/_memory/gas_gauge/gas_gauge_core.py")
+]
+
+MAX_LOAD_WORKERS = 8
+
+# Parsed memory files shared by every AutoInit in the process:
+# path -> (mtime_ns, size, parsed content)
+_memory_cache = {}
+_memory_cache_lock = threading.Lock()
+
+# Open warm-start snapshot, reused while the repository fingerprint matches
+_warm_snapshot = None
+
 class AutoInit:
     """TeamBadass repository auto-detection and initialization system"""
     
@@ -37,6 +61,10 @@ class AutoInit:
         self.gas_gauge_available = False
         self.memory_loaded = False
         self.repo_fingerprint = None
+        self.repo_changed = None
+        self.repo_root = "teambadass"
+        self.memory = {}
+        self.use_snapshot = True
         self.start_time = datetime.now()
         
         # Mobile-specific settings
@@ -49,6 +77,7 @@ class AutoInit:
             self.show_ascii_gauge = True
             self.compact_output = False
     
+    @PROFILER.timed("detect_repository")
     def detect_repository(self, context_files=None):
         """
         Detect TeamBadass repository presence from context files
@@ -100,24 +129,24 @@ class AutoInit:
         return False
     
     def _generate_repo_fingerprint(self):
-        """Generate a fingerprint of the repository for verification"""
+        """
+        Fingerprint the repository tree for verification and cache keys
+        
+        Sets repo_fingerprint to the digest of teambadass/ and repo_changed
+        to whether it differs from the digest cached by the last run.
+        """
         try:
-            # Simple fingerprint based on existence and modification times of key files
-            fingerprint = {}
-            key_files = [
-                "teambadass/README.md",
-                "teambadass/_memory/core/team-dynamics-json.json",
-                "teambadass/_memory/gas_gauge/gas_gauge_core.py"
-            ]
-            
-            for file_path in key_files:
-                if os.path.exists(file_path):
-                    fingerprint[file_path] = os.path.getmtime(file_path)
-            
-            self.repo_fingerprint = fingerprint
+            if not os.path.isdir(self.repo_root):
+                # Detected from context paths only; nothing local to hash
+                return
+            from repo_fingerprint import RepoFingerprint
+            result = RepoFingerprint(self.repo_root).compute()
+            self.repo_fingerprint = result["digest"]
+            self.repo_changed = result["changed"]
         except Exception as e:
             logger.error(f"Error generating fingerprint: {e}")
     
+    @PROFILER.timed("initialize_gas_gauge")
     def initialize_gas_gauge(self):
         """
         Initialize gas gauge with minimal output
@@ -130,15 +159,8 @@ class AutoInit:
         
         try:
             # Determine which gas gauge implementation to use
-            if os.path.exists("teambadass/_memory/gas_gauge/observable_gas_gauge.py"):
-                from teambadass._memory.gas_gauge.observable_gas_gauge import ObservableGasGauge
-                gauge = ObservableGasGauge()
-                gauge_type = "observable"
-            else:
-                # Fall back to core implementation
-                from teambadass._memory.gas_gauge.gas_gauge_core import ClaudeGasGauge
-                gauge = ClaudeGasGauge()
-                gauge_type = "core"
+            gauge_type, gauge_class = self._gauge_class()
+            gauge = gauge_class()
             
             # Perform initial gas check silently (just for measurement)
             gas_info = gauge.check_gas("initial")
@@ -166,6 +188,20 @@ class AutoInit:
             logger.error(f"Error initializing gas gauge: {e}")
             return {"status": "error", "message": f"Gas gauge initialization failed: {e}"}
     
+    def _gauge_class(self):
+        """
+        Import the preferred gauge implementation on first use
+        
+        Returns:
+            tuple: (gauge type, gauge class); the last implementation is the
+                fallback even when its source file is not found
+        """
+        for gauge_type, module_name, class_name, source in GAUGE_IMPLEMENTATIONS:
+            if gauge_type == GAUGE_IMPLEMENTATIONS[-1][0] or os.path.exists(source):
+                module = importlib.import_module(module_name)
+                return gauge_type, getattr(module, class_name)
+    
+    @PROFILER.timed("load_memory")
     def load_memory(self, min_files=True):
         """
         Load minimal TeamBadass memory to initialize context
@@ -191,21 +227,36 @@ class AutoInit:
                 "teambadass/_memory/core/technical-environment-json.json",
                 "teambadass/_memory/projects/furnace-project-json.json",
                 "teambadass/_memory/projects/memory-system-json.json"
-            ]
-            
-            # Determine which files to load
-            files_to_load = essential_files
-            if not min_files:
-                files_to_load += optional_files
+            ] + sorted(glob.glob("teambadass/projects/*-json.json"))
             
-            # Load files
-            loaded_files = []
-            for file_path in files_to_load:
-                if os.path.exists(file_path):
-                    # In a real implementation, we would load the file content here
-                    # For this script, we just track what would be loaded
-                    loaded_files.append(file_path)
+            # Determine which files to load (copy: never grow essential_files)
+            all_files = essential_files + [path for path in optional_files if path not in essential_files]
+            files_to_load = list(essential_files) if min_files else all_files
             
+            started = time.perf_counter()
+            snapshot = self._open_snapshot()
+            if snapshot is not None:
+                # Warm start: same tree as when the snapshot was written, so
+                # the same files exist; content is decoded on first access
+                source = "snapshot"
+                reports = [{"path": path, "loaded": path in snapshot, "cached": True, "bytes": 0,
+                            "parse_ms": 0.0, "error": None if path in snapshot else "missing"}
+                           for path in files_to_load]
+                loaded_files = [path for path in files_to_load if path in snapshot]
+                self.memory = snapshot.select(loaded_files)
+            else:
+                # Load files: cache hits inline, misses read and parsed concurrently.
+                # The snapshot covers every candidate, whichever set was asked for
+                source = "files"
+                snapshot_files = all_files if self._snapshot_path() else files_to_load
+                reports = self._load_files(snapshot_files)
+                loaded_files = [report["path"] for report in reports if report["loaded"]]
+                memory = {path: _memory_cache[path][2] for path in loaded_files if path in _memory_cache}
+                self._write_snapshot(memory)
+                reports = [report for report in reports if report["path"] in files_to_load]
+                loaded_files = [path for path in loaded_files if path in files_to_load]
+                self.memory = {path: memory[path] for path in loaded_files if path in memory}
+            load_ms = (time.perf_counter() - started) * 1000
             self.memory_loaded = True
             
             # Return status
@@ -218,12 +269,97 @@ class AutoInit:
                 "status": "success",
                 "files_loaded": len(loaded_files),
                 "files_total": len(files_to_load),
+                "bytes_loaded": sum(report["bytes"] for report in reports),
+                "load_ms": round(load_ms, 3),
+                "source": source,
+                "files": reports,
                 "display_message": status_message
             }
         except Exception as e:
             logger.error(f"Error loading memory: {e}")
             return {"status": "error", "message": f"Memory loading failed: {e}"}
     
+    def _load_files(self, paths):
+        """
+        Load memory files, reusing parsed content whose path/mtime/size match
+        
+        Returns:
+            list: Per-file report (path, loaded, cached, bytes, parse_ms, error)
+        """
+        reports = {}
+        misses = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                reports[path] = {"path": path, "loaded": False, "cached": False, "bytes": 0, "parse_ms": 0.0,
+                                 "error": "missing"}
+                continue
+            cached = _memory_cache.get(path)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                reports[path] = {"path": path, "loaded": True, "cached": True, "bytes": 0, "parse_ms": 0.0,
+                                 "error": None}
+            else:
+                misses.append(path)
+        
+        if len(misses) == 1:
+            reports[misses[0]] = _read_memory_file(misses[0])
+        elif misses:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(misses))) as pool:
+                for report in pool.map(_read_memory_file, misses):
+                    reports[report["path"]] = report
+        return [reports[path] for path in paths]
+    
+    def _snapshot_path(self):
+        """Warm-start snapshot file, or None when there is no fingerprint to key it on"""
+        if not self.use_snapshot or not self.repo_fingerprint:
+            return None
+        from memory_snapshot import SNAPSHOT_NAME
+        return os.path.join(self.repo_root, SNAPSHOT_NAME)
+    
+    def _open_snapshot(self):
+        """
+        Warm-start snapshot matching the current repository fingerprint
+        
+        Returns:
+            MemorySnapshot: Open snapshot, or None if missing, corrupt or stale
+        """
+        global _warm_snapshot
+        path = self._snapshot_path()
+        if path is None:
+            return None
+        if _warm_snapshot is not None:
+            if _warm_snapshot.fingerprint == self.repo_fingerprint:
+                return _warm_snapshot
+            # Repository changed: only drop the reference. Memory handed out
+            # earlier still reads from views over this mapping, so it is
+            # unmapped once the last of them is garbage collected
+            _warm_snapshot = None
+        from memory_snapshot import MemorySnapshot
+        try:
+            snapshot = MemorySnapshot.open(path)
+        except (OSError, ValueError):
+            return None
+        if snapshot.fingerprint != self.repo_fingerprint:
+            snapshot.close()
+            return None
+        _warm_snapshot = snapshot
+        return snapshot
+    
+    def _write_snapshot(self, memory):
+        """Replace the warm-start snapshot with freshly parsed memory"""
+        path = self._snapshot_path()
+        if path is None:
+            return
+        from memory_snapshot import write as write_snapshot
+        sizes = {p: _memory_cache[p][1] for p in memory if p in _memory_cache}
+        try:
+            write_snapshot(path, self.repo_fingerprint, memory, sizes)
+        except (OSError, ValueError) as e:
+            # Read-only checkout or content marshal cannot encode: cold loads still work
+            logger.debug(f"Memory snapshot not written: {e}")
+    
     def get_initialization_report(self):
         """
         Generate a minimal initialization report
@@ -260,12 +396,37 @@ class AutoInit:
             else:
                 report.append("⚠️ TeamBadass initialization incomplete")
             
+            if PROFILER.enabled:
+                report.append(PROFILER.format_report())
+            
             return "\n".join(report)
 
+def _read_memory_file(path):
+    """Read and parse one memory file into the shared cache (thread-pool worker)"""
+    report = {"path": path, "loaded": False, "cached": False, "bytes": 0, "parse_ms": 0.0, "error": None}
+    try:
+        with open(path, "rb") as f:
+            # fstat on the open file: the cache key matches the bytes read
+            st = os.fstat(f.fileno())
+            raw = f.read()
+        started = time.perf_counter()
+        content = json.loads(raw) if path.endswith(".json") else raw.decode("utf-8")
+        report["parse_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    except (OSError, ValueError) as e:
+        report["error"] = str(e)
+        return report
+    
+    with _memory_cache_lock:
+        _memory_cache[path] = (st.st_mtime_ns, st.st_size, content)
+    report["loaded"] = True
+    report["bytes"] = len(raw)
+    return report
+
 # Main execution - this can be used for testing
 if __name__ == "__main__":
     # Auto-detect if running on mobile
     import sys
+    logging.basicConfig(level=logging.INFO, format='%(message)s')  # Simplified format for mobile
     mobile_mode = "--mobile" in sys.argv
     
     # Create initializer with mobile optimization if needed
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: capacity_planner.py - Packs a task backlog into sessions with hop points
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: cost_model.py
+IMPORTED_BY: minimal_tracker.py
+
+TABLE_OF_CONTENTS:
+1. CapacityPlanner Class - Session-by-session scheduling of a backlog
+2. Packing - 0/1 knapsack DP over discretized costs, priority-weighted
+3. Dependencies - Only tasks whose prerequisites are done (or packed earlier
+   in the same session) are eligible; unresolvable ones are reported
+4. Output - Ordered sessions with usage after each task and hop points
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Each session is filled greedily in time but optimally in content: the
+knapsack picks the eligible subset with the highest sum of
+cost * priority that fits below the target threshold, then tasks
+unlocked by that subset get a second pass over the remaining room.
+Costs are rounded up to `resolution`, so a plan never overfills. Per
+weight, only as many of the most valuable tasks as could fit at once
+enter the DP. When that is still more than MAX_DP_WORK cells, the DP is
+limited to a core of tasks around the point where a greedy fill by
+value density stops: denser tasks are taken outright and the rest only
+fill what room the DP leaves.
+"""
+
+import math
+
+from cost_model import CostModel
+
+DEFAULT_RESOLUTION = 0.5
+# Upper bound on items x capacity cells per knapsack DP
+MAX_DP_WORK = 8000
+MIN_DP_CORE = 8
+# Value weight for priority <= 0: such tasks still pack, after everything else
+MIN_PRIORITY = 1e-3
+
+
+class CapacityPlanner:
+    """Schedules tasks across sessions below a usage threshold"""
+
+    def __init__(self, cost_model=None, thresholds=None, target="warning", session_base=0.0,
+                 resolution=DEFAULT_RESOLUTION):
+        """
+        Configure the planner
+
+        Args:
+            cost_model (CostModel): Cost model (defaults to cost_model.json)
+            thresholds (dict): warning/hard_stop percentages
+            target (str): Threshold a session is packed up to ("warning" or "hard_stop")
+            session_base (float): Usage a fresh session starts at (context reload)
+            resolution (float): Cost granularity of the packing DP, in percent
+        """
+        self.cost_model = cost_model or CostModel.load()
+        self.thresholds = dict(thresholds or {"warning": 60.0, "hard_stop": 90.0})
+        if target not in self.thresholds:
+            raise ValueError(f"Unknown target threshold: {target}")
+        self.target = target
+        self.session_base = session_base
+        self.resolution = resolution
+
+    def plan(self, tasks, usage=0.0):
+        """
+        Build a session-by-session plan for a backlog
+
+        Args:
+            tasks (list): Dicts with "type" and optional "id", "complexity",
+                "size", "priority" (default 1) and "depends_on" (list of ids)
+            usage (float): Usage of the current session
+
+        Returns:
+            dict: sessions (tasks with cost and usage_after), order, hops
+                (positions in order after which to hop), oversize and
+                unscheduled task ids, total_cost
+        """
+        limit = self.thresholds[self.target]
+        ids = [task.get("id", index) for index, task in enumerate(tasks)]
+        index_of = {task_id: index for index, task_id in enumerate(ids)}
+        if len(index_of) != len(ids):
+            raise ValueError("Task ids must be unique")
+
+        costs = self.cost_model.costs(
+            [task["type"] for task in tasks],
+            [task.get("complexity") for task in tasks],
+            [task.get("size") for task in tasks]
+        )
+        priorities = [task.get("priority", 1) for task in tasks]
+        weights = [max(int(math.ceil(cost / self.resolution - 1e-9)), 0) for cost in costs]
+        values = [cost * max(priority, MIN_PRIORITY) for cost, priority in zip(costs, priorities)]
+        # Position in (weight, most valuable first) order, for _pack's selection
+        order_of = [0] * len(tasks)
+        for position, i in enumerate(sorted(range(len(tasks)), key=lambda i: (weights[i], -values[i], i))):
+            order_of[i] = position
+        depends = [[index_of.get(dep, -1) for dep in task.get("depends_on", ())] for task in tasks]
+        unresolved = {i for i, deps in enumerate(depends) if -1 in deps}
+        dependents = [[] for _ in tasks]
+        for i, deps in enumerate(depends):
+            for d in deps:
+                if d >= 0:
+                    dependents[d].append(i)
+        full_session = limit - self.session_base
+
+        pending = set(range(len(tasks))) - unresolved
+        done = set()
+        sessions = []
+        start_usage = usage
+        while pending:
+            room = limit - start_usage
+            chosen = []
+            candidates = [i for i in pending if all(d in done for d in depends[i])]
+            while candidates:
+                capacity = int(math.floor(room / self.resolution + 1e-9))
+                picked = self._pack(candidates, weights, values, capacity, order_of)
+                if not picked:
+                    break
+                chosen.extend(picked)
+                room -= sum(costs[i] for i in picked)
+                # Packing is optimal over the candidates, so only tasks the
+                # picked ones unlock can still use the remaining room
+                ready = done.union(chosen)
+                candidates = sorted({child for i in picked for child in dependents[i]
+                                     if child in pending and child not in ready
+                                     and all(d in ready for d in depends[child])})
+
+            oversize = False
+            if not chosen:
+                eligible = [i for i in pending if all(d in done for d in depends[i])]
+                if not eligible:
+                    # Remaining tasks wait on each other (dependency cycle)
+                    break
+                if start_usage > self.session_base:
+                    # Nothing fits in what is left of this session: hop first
+                    sessions.append(self._session(len(sessions) + 1, start_usage, [], costs, ids, tasks))
+                    start_usage = self.session_base
+                    continue
+                # Larger than a whole fresh session: schedule it alone
+                chosen = [min(eligible, key=lambda i: (-priorities[i], i))]
+                oversize = costs[chosen[0]] > full_session
+
+            ordered = self._order(chosen, depends, priorities, done)
+            session = self._session(len(sessions) + 1, start_usage, ordered, costs, ids, tasks)
+            if oversize:
+                session["oversize"] = True
+            sessions.append(session)
+            done.update(chosen)
+            pending.difference_update(chosen)
+            start_usage = self.session_base
+
+        order = [entry["id"] for session in sessions for entry in session["tasks"]]
+        hops = []
+        position = 0
+        for session in sessions[:-1]:
+            position += len(session["tasks"])
+            hops.append(position)
+        return {
+            "sessions": sessions,
+            "order": order,
+            "hops": hops,
+            "oversize": [ids[i] for i in range(len(tasks)) if costs[i] > full_session and i in done],
+            "unscheduled": [ids[i] for i in sorted(pending | unresolved)],
+            "total_cost": round(sum(costs[i] for i in done), 1)
+        }
+
+    def _pack(self, eligible, weights, values, capacity, order_of):
+        """
+        0/1 knapsack over eligible tasks
+
+        Args:
+            eligible (list): Candidate task indices
+            weights (list): Discretized cost per task
+            values (list): cost * priority per task
+            capacity (int): Room in resolution units
+            order_of (list): Rank of each task by (weight, -value, index)
+
+        Returns:
+            list: Task indices maximizing the summed value within capacity
+        """
+        if capacity <= 0:
+            return []
+
+        # At most capacity // weight tasks of one weight fit together, so
+        # only that many of the most valuable ones can be in the optimum
+        free = []
+        candidates = []
+        current, quota = None, 0
+        for i in sorted(eligible, key=order_of.__getitem__):
+            weight = weights[i]
+            if weight == 0:
+                free.append(i)
+                continue
+            if weight > capacity:
+                break
+            if weight != current:
+                current, quota = weight, capacity // weight
+            if quota:
+                quota -= 1
+                candidates.append(i)
+
+        taken, candidates, rest = self._core(candidates, weights, values, capacity)
+        capacity -= sum(weights[i] for i in taken)
+        groups = {}
+        for i in candidates:
+            groups.setdefault((weights[i], values[i]), []).append(i)
+
+        # Identical tasks (same weight and value) form one bounded item,
+        # split into 1, 2, 4, ... sized pieces to keep the DP short
+        items = []
+        for (weight, value), members in groups.items():
+            limit = min(len(members), capacity // weight)
+            start, size = 0, 1
+            while start < limit:
+                size = min(size, limit - start)
+                items.append((members[start:start + size], weight * size, value * size))
+                start += size
+                size *= 2
+
+        # rows[k][w]: best value of the first k items using at most w units;
+        # an item was taken where its row differs from the previous one
+        best = [0.0] * (capacity + 1)
+        rows = [best]
+        for _, weight, value in items:
+            shifted = list(map(float(value).__add__, best[:capacity + 1 - weight]))
+            best = best[:weight] + list(map(max, shifted, best[weight:]))
+            rows.append(best)
+
+        picked = []
+        w = capacity
+        for k in range(len(items), 0, -1):
+            if rows[k][w] != rows[k - 1][w]:
+                members, weight, _ = items[k - 1]
+                picked.extend(members)
+                w -= weight
+
+        # Tasks left out of the core fill whatever room the DP left over
+        room = capacity - sum(weights[i] for i in picked)
+        for i in rest:
+            if weights[i] <= room:
+                picked.append(i)
+                room -= weights[i]
+        return sorted(free) + sorted(taken + picked)
+
+    def _core(self, candidates, weights, values, capacity):
+        """
+        Split candidates so the DP stays within MAX_DP_WORK cells
+
+        Args:
+            candidates (list): Task indices with 0 < weight <= capacity
+            weights (list): Discretized cost per task
+            values (list): cost * priority per task
+            capacity (int): Room in resolution units
+
+        Returns:
+            tuple: (taken, core, rest) - tasks packed outright, tasks for
+                the DP, and tasks only used to fill leftover room
+        """
+        core_size = max(MIN_DP_CORE, MAX_DP_WORK // (capacity + 1))
+        if len(candidates) <= core_size:
+            return [], candidates, []
+
+        # Densest first; among equally dense tasks the small ones end up
+        # in the core, where they are most useful for closing gaps
+        ranked = sorted(candidates, key=lambda i: (-values[i] / weights[i], -weights[i], i))
+        used = 0
+        stop = 0
+        while stop < len(ranked) and used + weights[ranked[stop]] <= capacity:
+            used += weights[ranked[stop]]
+            stop += 1
+        start = max(0, min(stop - core_size // 2, len(ranked) - core_size))
+        return ranked[:start], ranked[start:start + core_size], ranked[start + core_size:]
+
+    def _order(self, chosen, depends, priorities, done):
+        """Dependency-respecting order, highest priority first among ready tasks"""
+        remaining = set(chosen)
+        finished = set(done)
+        ordered = []
+        while remaining:
+            ready = min((i for i in remaining if all(d in finished for d in depends[i])),
+                        key=lambda i: (-priorities[i], i))
+            ordered.append(ready)
+            finished.add(ready)
+            remaining.discard(ready)
+        return ordered
+
+    def _session(self, number, start_usage, ordered, costs, ids, tasks):
+        """Session entry with running usage after each task"""
+        usage = start_usage
+        entries = []
+        for i in ordered:
+            usage += costs[i]
+            entries.append({
+                "id": ids[i],
+                "type": tasks[i]["type"],
+                "cost": round(costs[i], 1),
+                "usage_after": round(usage, 1)
+            })
+        return {
+            "session": number,
+            "start_usage": round(start_usage, 1),
+            "end_usage": round(usage, 1),
+            "tasks": entries
+        }
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: capacity_status.py - Usage status ladder shared by trackers and reports
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: None
+IMPORTED_BY: minimal_tracker.py, tracker_pool.py, event_ring.py
+
+TABLE_OF_CONTENTS:
+1. usage_status() - NORMAL / CAUTION / WARNING / CRITICAL for a usage level
+2. RECOMMENDATIONS - estimate() recommendation per status
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+"""
+
+# CAUTION starts at this fraction of the warning threshold
+CAUTION_FRACTION = 0.8
+
+RECOMMENDATIONS = {
+    "CRITICAL": "New session first",
+    "WARNING": "Complete then hop",
+    "CAUTION": "Monitor capacity",
+    "NORMAL": "Proceed"
+}
+
+
+def usage_status(usage, warning, hard_stop):
+    """
+    Status of a usage level against a session's thresholds
+
+    Args:
+        usage (float): Usage percentage
+        warning (float): Warning threshold
+        hard_stop (float): Hard stop threshold
+
+    Returns:
+        str: "CRITICAL", "WARNING", "CAUTION" or "NORMAL"
+    """
+    if usage >= hard_stop:
+        return "CRITICAL"
+    elif usage >= warning:
+        return "WARNING"
+    elif usage >= warning * CAUTION_FRACTION:
+        return "CAUTION"
+    return "NORMAL"
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for concurrent_tracker.py
+
+Hammers one tracker from a growing number of threads, verifies that no
+updates are lost and that each threshold crossing is reported exactly
+once, and prints throughput per thread count.
+
+Usage: python concurrent-tracker-stress.py [ops_per_thread] [max_threads]
+"""
+
+import sys
+import time
+import threading
+
+from concurrent_tracker import ConcurrentTracker
+from minimal_tracker import MinimalTracker
+
+OPERATIONS = [("code", "low", "small"), ("discuss", None, 100), ("plan", "low", None), ("search", 2, None)]
+
+
+def hammer(tracker, thread_count, ops_per_thread):
+    """Run ops_per_thread registrations on each of thread_count threads"""
+    messages = []
+    start_barrier = threading.Barrier(thread_count)
+
+    def worker():
+        local_messages = []
+        start_barrier.wait()
+        for i in range(ops_per_thread):
+            message = tracker.register(*OPERATIONS[i % len(OPERATIONS)])
+            if message:
+                local_messages.append(message)
+        messages.extend(local_messages)
+
+    threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, messages
+
+
+def expected_usage(tracker, thread_count, ops_per_thread):
+    """Usage a lossless run must end at"""
+    per_thread = sum(tracker._calculate_cost(*OPERATIONS[i % len(OPERATIONS)]) for i in range(ops_per_thread))
+    return per_thread * thread_count
+
+
+def verify(tracker, thread_count, ops_per_thread, messages):
+    """Check totals and exactly-once threshold reporting"""
+    expected = expected_usage(tracker, thread_count, ops_per_thread)
+    op_count = sum(op["count"] for op in tracker.operations.values())
+
+    problems = []
+    if op_count != thread_count * ops_per_thread:
+        problems.append(f"lost {thread_count * ops_per_thread - op_count} op counts")
+    if abs(tracker.usage - expected) > 1e-6 * expected:
+        problems.append(f"usage {tracker.usage:.1f} != {expected:.1f}")
+    warnings = sum(1 for m in messages if m.startswith("⚠️"))
+    hard_stops = sum(1 for m in messages if m.startswith("🛑"))
+    if (warnings, hard_stops) != (1, 1):
+        problems.append(f"{warnings} warning / {hard_stops} hard stop messages")
+    return problems
+
+
+def run_stress(ops_per_thread=20000, max_threads=8):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Concurrent tracker stress ({ops_per_thread} ops/thread, GIL {'enabled' if gil else 'disabled'})")
+    print(f"{'tracker':<18} {'threads':>7} {'ops/sec':>12} {'result':<}")
+
+    thread_count = 1
+    while thread_count <= max_threads:
+        for tracker_class in (MinimalTracker, ConcurrentTracker):
+            tracker = tracker_class(silent=True)
+            # Place thresholds so both are crossed part-way through the run
+            total = expected_usage(tracker, thread_count, ops_per_thread)
+            tracker.thresholds = {"warning": total * 0.3, "hard_stop": total * 0.6}
+
+            elapsed, messages = hammer(tracker, thread_count, ops_per_thread)
+            problems = verify(tracker, thread_count, ops_per_thread, messages)
+            rate = thread_count * ops_per_thread / elapsed
+            result = "ok" if not problems else "; ".join(problems)
+            print(f"{tracker_class.__name__:<18} {thread_count:>7} {rate:>12,.0f} {result}")
+        thread_count *= 2
+
+
+if __name__ == "__main__":
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    run_stress(ops, threads)
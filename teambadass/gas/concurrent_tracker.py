@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: concurrent_tracker.py - Thread-safe session capacity tracker
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: minimal_tracker.py, quantile_sketch.py
+IMPORTED_BY: concurrent-tracker-stress.py
+
+TABLE_OF_CONTENTS:
+1. ConcurrentTracker Class - MinimalTracker safe for use from thread pools
+2. Per-thread Shards - Lock-free counters, usage and queued sketch costs
+3. Threshold Crossing - Lock-free pre-check; the lock is only taken to report
+4. Dead Threads - Shards of finished threads folded into retired totals
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+register() writes only to a shard owned by the calling thread: per-op
+(count, cost) tuples replaced whole, its share of usage and a queue of
+costs for the sketches. Usage is the sum over shards, compared against the
+thresholds without a lock; the lock is taken only when a threshold lies
+between the last checked usage and the current one, when events are
+recorded, or to fold queued costs into the sketches. Readers take the
+shard list and retired totals from one tuple, so merged totals never count
+a shard twice or see a count without its cost.
+"""
+
+import threading
+from collections import deque
+from itertools import accumulate
+
+from minimal_tracker import MinimalTracker, logger
+from quantile_sketch import CostSketch
+
+# Queued sketch costs a thread folds in itself once reached
+PENDING_COSTS = 1024
+
+
+class _Shard:
+    """Counters written only by the owning thread (retired totals when owner is None)"""
+
+    __slots__ = ("owner", "ops", "usage", "changes", "pending")
+
+    def __init__(self, owner=None, ops=None, usage=0.0, changes=0):
+        self.owner = owner
+        # op_type -> (count, total_cost), replaced as a unit
+        self.ops = ops if ops is not None else {}
+        self.usage = usage
+        self.changes = changes
+        # (op_type, cost) not yet in the shared sketches
+        self.pending = deque()
+
+
+class ConcurrentTracker(MinimalTracker):
+    """MinimalTracker variant for concurrent register() calls"""
+
+    def __init__(self, silent=True, cost_model=None, metrics_store=None):
+        """Initialize tracker with shard registry and reporting lock"""
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._local = threading.local()
+        # (retired totals, live shards), swapped as a unit
+        self._registry = (_Shard(), ())
+        self._sketches = {}
+        # Usage at the last threshold check; crossings above it are unreported
+        self._checked_usage = 0.0
+        super().__init__(silent=silent, cost_model=cost_model, metrics_store=metrics_store)
+
+    @property
+    def usage(self):
+        """Usage summed across retired totals and thread shards"""
+        retired, shards = self._registry
+        usage = retired.usage
+        for shard in shards:
+            usage += shard.usage
+        return usage
+
+    @usage.setter
+    def usage(self, usage):
+        """Set the total (restores); the difference goes to the retired totals"""
+        with self._lock:
+            retired, shards = self._registry
+            retired.usage = usage - sum(shard.usage for shard in shards)
+            self._checked_usage = usage
+
+    @property
+    def version(self):
+        """State version: changes counted across all shards"""
+        retired, shards = self._registry
+        return retired.changes + sum(shard.changes for shard in shards)
+
+    @version.setter
+    def version(self, version):
+        with self._lock:
+            retired, shards = self._registry
+            retired.changes = version - sum(shard.changes for shard in shards)
+
+    @property
+    def operations(self):
+        """Per-op totals merged across retired totals and thread shards"""
+        retired, shards = self._registry
+        merged = {}
+        for shard in (retired,) + shards:
+            # Entries are (count, cost) tuples, so a pair is never torn
+            for op_type, (count, total_cost) in list(shard.ops.items()):
+                totals = merged.setdefault(op_type, {"count": 0, "total_cost": 0})
+                totals["count"] += count
+                totals["total_cost"] += total_cost
+        return merged
+
+    @operations.setter
+    def operations(self, operations):
+        """Replace all per-op totals (usage and version are kept)"""
+        with self._lock:
+            self._drain_sketches()
+            usage, version = self.usage, self.version
+            ops = {op_type: (data["count"], data["total_cost"]) for op_type, data in operations.items()}
+            self._registry = (_Shard(None, ops, usage, version), ())
+            self._local = threading.local()
+
+    @property
+    def sketches(self):
+        """Per-op cost sketches, with costs queued by register() folded in"""
+        with self._lock:
+            self._drain_sketches()
+            return self._sketches
+
+    @sketches.setter
+    def sketches(self, sketches):
+        with self._lock:
+            self._drain_sketches()
+            self._sketches = sketches
+
+    def register(self, op_type, complexity=None, size=None):
+        """Register operation from any thread; crossings are reported exactly once"""
+        cost = self._calculate_cost(op_type, complexity, size)
+
+        # Only the owning thread writes its shard
+        shard = self._shard()
+        count, total_cost = shard.ops.get(op_type, (0, 0))
+        shard.ops[op_type] = (count + 1, total_cost + cost)
+        shard.usage += cost
+        shard.pending.append((op_type, cost))
+        shard.changes += 1
+
+        # Lock only if a threshold may have been crossed since the last check
+        message = None
+        usage = self.usage
+        checked = self._checked_usage
+        if self.events is not None or usage < checked or self._threshold_crossing(checked, usage):
+            with self._lock:
+                usage = self.usage
+                crossing = self._threshold_crossing(self._checked_usage, usage)
+                self._checked_usage = usage
+                if crossing:
+                    message = self._crossing_message(crossing, usage)
+                if self.events is not None:
+                    self.events.record(op_type, cost, usage, crossing)
+
+        if len(shard.pending) >= PENDING_COSTS:
+            with self._lock:
+                self._drain_sketches()
+        if self.on_change:
+            self.on_change(self)
+        if message and not self.silent:
+            logger.info(message)
+        return message
+
+    def register_many(self, op_types, complexities=None, sizes=None):
+        """Register a batch, reporting crossings since the last check against its rows"""
+        costs = self._calculate_costs(op_types, complexities, sizes)
+        if not costs:
+            return []
+
+        grouped = {}
+        for op_type, cost in zip(op_types, costs):
+            grouped.setdefault(op_type, []).append(cost)
+
+        with self._lock:
+            start = self.usage
+            cumulative = list(accumulate(costs, initial=start))[1:]
+            for op_type, op_costs in grouped.items():
+                self._add_op_costs(op_type, op_costs)
+            # A crossing a register() has not reported yet goes to the first row
+            checked = self._checked_usage
+            crossings = self._find_crossings(checked, cumulative, checked <= start and min(costs) >= 0)
+            self._checked_usage = cumulative[-1]
+
+            if self.events is not None:
+                kinds = dict(crossings)
+                for index, (op_type, cost, usage) in enumerate(zip(op_types, costs, cumulative)):
+                    self.events.record(op_type, cost, usage, kinds.get(index))
+            messages = [(index, self._crossing_message(kind, cumulative[index])) for index, kind in crossings]
+
+        self._mark_changed()
+        if not self.silent:
+            for _, message in messages:
+                logger.info(message)
+        return messages
+
+    def save_metrics(self):
+        """Save metrics, serializing concurrent savers"""
+        with self._save_lock:
+            return super().save_metrics()
+
+    def snapshot(self, path):
+        """Write a snapshot while no queued costs are folded into the sketches"""
+        with self._lock:
+            return super().snapshot(path)
+
+    def register_threshold(self, threshold_type, value=None):
+        """Register threshold observation without racing register()"""
+        with self._lock:
+            return super().register_threshold(threshold_type, value)
+
+    def adapt_thresholds(self, warning=None, hard_stop=None):
+        """Adapt thresholds without racing register()"""
+        with self._lock:
+            return super().adapt_thresholds(warning, hard_stop)
+
+    def _mark_changed(self):
+        """Count the change in the calling thread's shard and notify any listener"""
+        self._shard().changes += 1
+        if self.on_change:
+            self.on_change(self)
+
+    def _session_record(self):
+        """Session record built while no queued costs are folded into the sketches"""
+        with self._lock:
+            return super()._session_record()
+
+    def _add_op_costs(self, op_type, op_costs):
+        """Add batch costs to the calling thread's shard"""
+        shard = self._shard()
+        count, total_cost = shard.ops.get(op_type, (0, 0))
+        batch_cost = sum(op_costs)
+        shard.ops[op_type] = (count + len(op_costs), total_cost + batch_cost)
+        shard.usage += batch_cost
+        shard.pending.extend((op_type, cost) for cost in op_costs)
+
+    def _drain_sketches(self, shards=None):
+        """Fold queued costs into the shared sketches (caller holds the lock)"""
+        sketches = self._sketches
+        for shard in self._registry[1] if shards is None else shards:
+            pending = shard.pending
+            # Only drainers pop, so at least this many are queued
+            for _ in range(len(pending)):
+                op_type, cost = pending.popleft()
+                sketch = sketches.get(op_type)
+                if sketch is None:
+                    sketch = sketches[op_type] = CostSketch()
+                sketch.add(cost)
+
+    def _shard(self):
+        """Per-op counters owned by the calling thread"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                retired, shards = self._registry
+                self._registry = self._retire_dead(retired, shards + (shard,))
+        return shard
+
+    def _retire_dead(self, retired, shards):
+        """Fold shards of finished threads into new retired totals (caller holds the lock)"""
+        alive, dead = [], []
+        for shard in shards:
+            (alive if shard.owner.is_alive() else dead).append(shard)
+        if not dead:
+            return retired, shards
+        self._drain_sketches(dead)
+        ops = dict(retired.ops)
+        usage, changes = retired.usage, retired.changes
+        for shard in dead:
+            for op_type, (count, total_cost) in shard.ops.items():
+                old_count, old_cost = ops.get(op_type, (0, 0))
+                ops[op_type] = (old_count + count, old_cost + total_cost)
+            usage += shard.usage
+            changes += shard.changes
+        return _Shard(None, ops, usage, changes), tuple(alive)
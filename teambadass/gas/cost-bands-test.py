@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for cost percentile bands in minimal_tracker.py
+
+Checks that costs this session already saved are not counted twice when
+its live sketch is combined with history from load_history(), both
+after save_metrics() and after a snapshot restore().
+"""
+
+import os
+import shutil
+import tempfile
+
+from metrics_log import SegmentedMetricsLog
+from minimal_tracker import MinimalTracker
+
+
+def observed(tracker, op_type):
+    """Observations behind the tracker's cost bands for one op type"""
+    history = tracker.history_sketches.get(op_type) if tracker.history_sketches else None
+    live = tracker.sketches.get(op_type)
+    return (history.count if history is not None else 0) + (live.count if live is not None else 0)
+
+
+def run_test():
+    print("Testing cost bands after save and load_history...")
+    directory = tempfile.mkdtemp()
+    try:
+        tracker = MinimalTracker(silent=True, metrics_store=SegmentedMetricsLog(directory))
+        for _ in range(10):
+            tracker.register("code", "low", "small")
+        tracker.save_metrics()
+        tracker.register("code", "high", "large")
+
+        print("- save -> load_history -> estimate")
+        tracker.load_history()
+        assert tracker.estimate("code", "low", "small").get("bands")
+        assert observed(tracker, "code") == 11, observed(tracker, "code")
+
+        print("- restore -> load_history -> estimate")
+        path = os.path.join(directory, "tracker.snapshot")
+        tracker.snapshot(path)
+        restored = MinimalTracker.restore(path, silent=True, metrics_store=SegmentedMetricsLog(directory))
+        restored.load_history()
+        assert restored.estimate("code", "low", "small").get("bands")
+        assert observed(restored, "code") == 11, observed(restored, "code")
+
+        print("- other sessions still count")
+        other = MinimalTracker(silent=True, metrics_store=SegmentedMetricsLog(directory))
+        other.register("code", "low", "small")
+        other.load_history()
+        assert observed(other, "code") == 11, observed(other, "code")
+    finally:
+        shutil.rmtree(directory)
+
+    print("\nTest completed successfully!")
+
+
+if __name__ == "__main__":
+    run_test()
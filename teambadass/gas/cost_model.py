@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: cost_model.py - Declarative operation cost model
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: cost_model.json
+IMPORTED_BY: minimal_tracker.py
+
+TABLE_OF_CONTENTS:
+1. CostModel Class - Cost definition compiled to a flat lookup table
+2. Model Loading - JSON (or TOML) definitions, loaded once per path
+3. Cost Lookup - Single indexed lookup with linear-term fallback
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Each operation is defined by a base cost, optional "complexity"/"size"
+factor tables, and an optional linear term ("per_kb", "per_word",
+"per_result", ...) applied to a numeric argument:
+
+    cost = base * complexity_factor * size_factor + per_unit * units
+
+"units" names the argument carrying the numeric value and
+"default_units" is used when that argument is not a number.
+"""
+
+import os
+import json
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cost_model.json")
+
+_loaded_models = {}
+
+
+class CostModel:
+    """Operation cost model compiled into a (op_type, complexity, size) table"""
+
+    def __init__(self, definition):
+        """
+        Compile a cost model definition
+
+        Args:
+            definition (dict): Parsed cost model (see module docstring)
+        """
+        self.definition = definition
+        self.default_cost = definition.get("default_cost", 3.0)
+        self.default_level = definition.get("default_level", "medium")
+        self.operations = definition["operations"]
+        self._terms = {op_type: self._compile_terms(spec) for op_type, spec in self.operations.items()}
+        self._table = self._compile_table()
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Load a cost model definition, compiling each path only once
+
+        Args:
+            path (str): JSON or TOML definition (defaults to cost_model.json)
+
+        Returns:
+            CostModel: Shared compiled model for that path
+        """
+        path = os.path.abspath(path or DEFAULT_MODEL_PATH)
+        model = _loaded_models.get(path)
+        if model is None:
+            if path.endswith(".toml"):
+                import tomllib
+                with open(path, "rb") as f:
+                    definition = tomllib.load(f)
+            else:
+                with open(path, "r") as f:
+                    definition = json.load(f)
+            model = _loaded_models[path] = cls(definition)
+        return model
+
+    def cost(self, op_type, complexity=None, size=None):
+        """Cost of one operation as a single table lookup"""
+        complexity = complexity or self.default_level
+        size = size or self.default_level
+        try:
+            return self._table[(op_type, complexity, size)]
+        except (KeyError, TypeError):
+            return self._compute(op_type, complexity, size)
+
+    def costs(self, op_types, complexities, sizes):
+        """Costs for columnar inputs, computed once per distinct row"""
+        memo = {}
+        costs = []
+        for key in zip(op_types, complexities, sizes):
+            cost = memo.get(key)
+            if cost is None:
+                cost = memo[key] = self.cost(*key)
+            costs.append(cost)
+        return costs
+
+    def _compile_terms(self, spec):
+        """Reduce an operation spec to (base, factor tables, linear term)"""
+        linear = None
+        for key, value in spec.items():
+            if key.startswith("per_"):
+                linear = (value, spec.get("units", "size"), spec.get("default_units", 0))
+        return (spec["base"], spec.get("complexity"), spec.get("size"), linear)
+
+    def _compile_table(self):
+        """Precompute every categorical (op_type, complexity, size) cost"""
+        levels = {self.default_level}
+        for spec in self.operations.values():
+            levels.update(spec.get("complexity", {}))
+            levels.update(spec.get("size", {}))
+
+        table = {}
+        for op_type in self.operations:
+            for complexity in levels:
+                for size in levels:
+                    table[(op_type, complexity, size)] = self._compute(op_type, complexity, size)
+        return table
+
+    def _compute(self, op_type, complexity, size):
+        """Evaluate the cost formula directly (table misses and numeric units)"""
+        terms = self._terms.get(op_type)
+        if terms is None:
+            return self.default_cost
+
+        base, complexity_factors, size_factors, linear = terms
+        cost = base
+        if complexity_factors:
+            cost = cost * complexity_factors.get(complexity, complexity_factors[self.default_level])
+        if size_factors:
+            cost = cost * size_factors.get(size, size_factors[self.default_level])
+        if linear:
+            per_unit, units_arg, default_units = linear
+            units = complexity if units_arg == "complexity" else size
+            if not isinstance(units, (int, float)):
+                units = default_units
+            cost = cost + (per_unit * units)
+        return cost
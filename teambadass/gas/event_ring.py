@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: event_ring.py - Fixed-capacity ring buffer of per-operation events
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: capacity_status.py
+IMPORTED_BY: minimal_tracker.py
+
+TABLE_OF_CONTENTS:
+1. EventRing Class - Typed-array columns (time, op code, cost, usage, crossing)
+2. Recording - O(1) record() without per-event allocation; oldest events overwritten
+3. Replay - Chronological events, recorded or what-if threshold crossings
+4. Export - JSON-friendly columns and tracking.md-style markdown timelines
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+"""
+
+import time
+from array import array
+from collections import namedtuple
+
+from capacity_status import usage_status
+
+DEFAULT_CAPACITY = 4096
+
+# Crossing kind -> stored flag
+CROSSING_FLAGS = {None: 0, "warning": 1, "hard_stop": 2}
+CROSSING_KINDS = {flag: kind for kind, flag in CROSSING_FLAGS.items()}
+
+Event = namedtuple("Event", "time op_type cost usage crossing")
+
+
+class EventRing:
+    """Most recent register() events in preallocated typed arrays"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Allocate an empty ring
+
+        Args:
+            capacity (int): Events kept before the oldest are overwritten
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self.op_types = []
+        self._op_codes = {}
+        self._times = array("d", bytes(8 * capacity))
+        self._codes = array("H", bytes(2 * capacity))
+        self._costs = array("d", bytes(8 * capacity))
+        self._usage = array("d", bytes(8 * capacity))
+        self._crossings = bytearray(capacity)
+        self._next = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def dropped(self):
+        """Events overwritten because the ring was full"""
+        return max(self.total - self.capacity, 0)
+
+    def record(self, op_type, cost, usage, crossing=None, timestamp=None):
+        """
+        Record one operation
+
+        Args:
+            op_type (str): Operation type
+            cost (float): Cost charged
+            usage (float): Cumulative usage after the operation
+            crossing (str): "warning"/"hard_stop" if this operation crossed one
+            timestamp (float): Epoch seconds (now if omitted)
+        """
+        code = self._op_codes.get(op_type)
+        if code is None:
+            code = self._op_codes[op_type] = len(self.op_types)
+            self.op_types.append(op_type)
+        i = self._next
+        self._times[i] = time.time() if timestamp is None else timestamp
+        self._codes[i] = code
+        self._costs[i] = cost
+        self._usage[i] = usage
+        self._crossings[i] = CROSSING_FLAGS[crossing]
+        self._next = i + 1 if i + 1 < self.capacity else 0
+        self.total += 1
+
+    def clear(self):
+        """Forget all events (op type codes are kept)"""
+        self.total = 0
+        self._next = 0
+
+    def columns(self):
+        """
+        Chronological copies of the stored columns
+
+        Returns:
+            dict: time, op (codes into op_types), cost, usage, crossing arrays
+        """
+        if self.total <= self.capacity:
+            order = slice(0, self.total)
+            return {
+                "time": self._times[order],
+                "op": self._codes[order],
+                "cost": self._costs[order],
+                "usage": self._usage[order],
+                "crossing": self._crossings[order]
+            }
+        # Full ring: oldest event sits at the write position
+        i = self._next
+        return {
+            "time": self._times[i:] + self._times[:i],
+            "op": self._codes[i:] + self._codes[:i],
+            "cost": self._costs[i:] + self._costs[:i],
+            "usage": self._usage[i:] + self._usage[:i],
+            "crossing": self._crossings[i:] + self._crossings[:i]
+        }
+
+    def events(self):
+        """Replay stored events oldest first as Event tuples"""
+        columns = self.columns()
+        op_types = self.op_types
+        for timestamp, code, cost, usage, flag in zip(columns["time"], columns["op"], columns["cost"],
+                                                      columns["usage"], columns["crossing"]):
+            yield Event(timestamp, op_types[code], cost, usage, CROSSING_KINDS[flag])
+
+    def crossings(self, thresholds=None):
+        """
+        Events that crossed a threshold
+
+        Args:
+            thresholds (dict): warning/hard_stop to replay against instead of
+                the crossings recorded at the time (what-if analysis)
+
+        Returns:
+            list: (Event, kind) in chronological order
+        """
+        if thresholds is None:
+            return [(event, event.crossing) for event in self.events() if event.crossing]
+
+        warning = thresholds["warning"]
+        hard_stop = thresholds["hard_stop"]
+        result = []
+        pre = None
+        for event in self.events():
+            if pre is None:
+                pre = event.usage - event.cost
+            # Same precedence as MinimalTracker.register(): warning first
+            if pre < warning and event.usage >= warning:
+                result.append((event, "warning"))
+            elif pre < hard_stop and event.usage >= hard_stop:
+                result.append((event, "hard_stop"))
+            pre = event.usage
+        return result
+
+    def export(self):
+        """
+        JSON-serializable form of the stored events
+
+        Returns:
+            dict: capacity, total, op_types and chronological column lists
+        """
+        columns = self.columns()
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "op_types": list(self.op_types),
+            "time": columns["time"].tolist(),
+            "op": columns["op"].tolist(),
+            "cost": columns["cost"].tolist(),
+            "usage": columns["usage"].tolist(),
+            "crossing": list(columns["crossing"])
+        }
+
+    @classmethod
+    def from_export(cls, data):
+        """Rebuild a ring from export() output"""
+        ring = cls(data["capacity"])
+        count = len(data["op"])
+        ring.op_types = list(data["op_types"])
+        ring._op_codes = {op_type: code for code, op_type in enumerate(ring.op_types)}
+        ring._times[:count] = array("d", data["time"])
+        ring._codes[:count] = array("H", data["op"])
+        ring._costs[:count] = array("d", data["cost"])
+        ring._usage[:count] = array("d", data["usage"])
+        ring._crossings[:count] = bytes(data["crossing"])
+        ring._next = count % ring.capacity
+        # Events dropped before export are gone; only their count is kept
+        ring.total = data["total"]
+        return ring
+
+    def to_markdown(self, thresholds, title="Operation Timeline"):
+        """
+        Render the events as a tracking.md-style timeline
+
+        Args:
+            thresholds (dict): warning/hard_stop used for statuses and gauges
+            title (str): Section heading
+
+        Returns:
+            str: Markdown with an operation table, gauge history and indicators
+        """
+        warning = thresholds["warning"]
+        hard_stop = thresholds["hard_stop"]
+        events = list(self.events())
+
+        lines = [f"### {title}", ""]
+        if self.dropped:
+            lines += [f"_{self.dropped} earlier operations not retained_", ""]
+        lines += [
+            "| Time | Operation | Estimated Usage | Cumulative Usage | Status |",
+            "|------|-----------|----------------|------------------|--------|"
+        ]
+        for event in events:
+            clock = time.strftime("%H:%M:%S", time.localtime(event.time))
+            status = usage_status(event.usage, warning, hard_stop)
+            lines.append(f"| {clock} | {event.op_type} | {event.cost:.1f}% | {event.usage:.1f}% | {status} |")
+
+        lines += ["", "### ASCII Gauge Status History", "", "```"]
+        for event, kind in self.crossings():
+            label = "Long chats warning" if kind == "warning" else "Hard stop"
+            lines.append(f"{_gauge(event.usage, warning, hard_stop)} {event.usage:.1f}% - {label} after {event.op_type}")
+        if events:
+            last = events[-1]
+            lines.append(f"{_gauge(last.usage, warning, hard_stop)} {last.usage:.1f}% - After {last.op_type}")
+        lines += ["```", "", "### Warning Indicators"]
+
+        first = {}
+        for event, kind in self.crossings():
+            first.setdefault(kind, event)
+        for kind, label in (("warning", "Long Chats Warning"), ("hard_stop", "Hard Stop")):
+            event = first.get(kind)
+            lines.append(f"- **{label} Observed**: {'Yes' if event else 'No'}")
+            if event:
+                lines.append(f"- **Observed at Usage**: {event.usage:.1f}% ({event.op_type})")
+        return "\n".join(lines) + "\n"
+
+
+def _gauge(usage, warning, hard_stop, width=28):
+    """ASCII gauge with W/H markers, as drawn in tracking.md"""
+    cells = [" "] * width
+    for i in range(min(int(usage / 100 * width), width)):
+        cells[i] = "="
+    cells[min(int(warning / 100 * width), width - 1)] = "W"
+    cells[min(int(hard_stop / 100 * width), width - 1)] = "H"
+    return "[" + "".join(cells) + "]"
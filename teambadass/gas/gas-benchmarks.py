@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the gas tracking and initialization hot paths
+
+Covers MinimalTracker register/estimate/check/save_metrics (save_metrics
+at growing history sizes), AutoInit detect_repository/load_memory and
+MobileSession.process_command. Every benchmark runs inside a scratch
+directory so no repository files are touched.
+
+Usage:
+    python gas-benchmarks.py                       # Print results
+    python gas-benchmarks.py --output results.json # Also write JSON
+    python gas-benchmarks.py --save-baseline       # Store as baseline
+    python gas-benchmarks.py --compare             # Fail on regressions vs baseline
+"""
+
+import os
+import sys
+import json
+import shutil
+import timeit
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, "benchmark-baseline.json")
+HISTORY_SIZES = (0, 100, 1000, 10000)
+QUICK_HISTORY_SIZES = (0, 100)
+
+sys.path.insert(0, SCRIPT_DIR)
+
+
+class FakeGauge:
+    """Stand-in gas gauge exposing the attributes MobileSession reads"""
+
+    current_level = 42.0
+    resource_map = {"thresholds": {"long_chats_warning": 60.0, "hard_stop": 90.0}}
+
+    def check_gas(self, label=None):
+        return {"level": self.current_level, "status": "NORMAL", "gauge": "[=====     ] 42.0%"}
+
+    def format_status_report(self):
+        return f"Gas: {self.current_level}%"
+
+    def check_buffers(self):
+        return {"status": "NORMAL", "available_for_work": 18.0}
+
+    def pre_task_assessment(self, description, task_type, complexity, size):
+        return {
+            "estimated_cost": "15.0%",
+            "post_task_remaining": "43.0%",
+            "decision_options": [{"option": "Proceed", "description": "Enough capacity"}]
+        }
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """Time func with timeit; returns the best per-call time of several runs"""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    # Scale up to min_time per run for stable numbers on fast calls
+    number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+    runs = timer.repeat(repeat=repeat, number=number)
+    best = min(runs) / number
+    return {
+        "mean_us": round(sum(runs) / len(runs) / number * 1e6, 3),
+        "best_us": round(best * 1e6, 3),
+        "ops_per_sec": round(1 / best, 1),
+        "calls": number * repeat
+    }
+
+
+def bench_tracker(results, history_sizes, repeat):
+    """MinimalTracker hot paths"""
+    from minimal_tracker import MinimalTracker
+
+    tracker = MinimalTracker(silent=True)
+    tracker.thresholds = {"warning": float("inf"), "hard_stop": float("inf")}
+    results["tracker.register"] = measure(lambda: tracker.register("code", "high", "large"), repeat)
+    results["tracker.register_numeric"] = measure(lambda: tracker.register("context", size=80), repeat)
+    results["tracker.estimate"] = measure(lambda: tracker.estimate("artifact", "high", "large"), repeat)
+    results["tracker.check"] = measure(tracker.check, repeat)
+
+    batch = (["code", "discuss", "plan", "search"] * 250, None, None)
+    results["tracker.register_many_1000"] = measure(lambda: tracker.register_many(*batch), repeat)
+
+    for size in history_sizes:
+        scratch = tempfile.mkdtemp(prefix="gas-bench-")
+        cwd = os.getcwd()
+        try:
+            os.chdir(scratch)
+            seed = MinimalTracker(silent=True)
+            seed.register("code")
+            for _ in range(size):
+                seed.save_metrics()
+            saver = MinimalTracker(silent=True)
+            saver.register("code", "medium", "medium")
+            results[f"tracker.save_metrics[history={size}]"] = measure(saver.save_metrics, repeat, min_time=0.1)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+def build_repository(root):
+    """Minimal teambadass tree with memory files for AutoInit"""
+    core = os.path.join(root, "teambadass", "_memory", "core")
+    projects = os.path.join(root, "teambadass", "_memory", "projects")
+    os.makedirs(core)
+    os.makedirs(projects)
+    with open(os.path.join(root, "teambadass", "README.md"), "w") as f:
+        f.write("# TeamBadass\n")
+    payload = {"entries": [{"id": i, "text": "x" * 200} for i in range(200)]}
+    for name in ("team-dynamics-json.json", "project-history-json.json", "technical-environment-json.json"):
+        with open(os.path.join(core, name), "w") as f:
+            json.dump(payload, f)
+    for name in ("furnace-project-json.json", "memory-system-json.json"):
+        with open(os.path.join(projects, name), "w") as f:
+            json.dump(payload, f)
+
+
+def bench_auto_init(results, repeat):
+    """AutoInit detection and memory loading"""
+    scratch = tempfile.mkdtemp(prefix="gas-bench-")
+    cwd = os.getcwd()
+    try:
+        build_repository(scratch)
+        os.chdir(scratch)
+        from auto_init import AutoInit
+
+        init = AutoInit(mobile_optimized=True)
+        results["auto_init.detect_repository"] = measure(init.detect_repository, repeat)
+        init.detect_repository()
+        results["auto_init.load_memory[min]"] = measure(lambda: init.load_memory(min_files=True), repeat)
+        results["auto_init.load_memory[full]"] = measure(lambda: init.load_memory(min_files=False), repeat)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def bench_mobile(results, repeat):
+    """MobileSession command processing against a fake gauge"""
+    from mobile_integration import MobileSession
+
+    for mobile in (True, False):
+        session = MobileSession()
+        session.is_mobile = mobile
+        session.initialized = True
+        session.gas_gauge = FakeGauge()
+        mode = "mobile" if mobile else "desktop"
+        for command in ("/g", "/s", "/p code medium large", "/h"):
+            name = command.split()[0]
+            results[f"mobile.process_command[{name},{mode}]"] = measure(
+                lambda: session.process_command(command), repeat)
+
+
+def run_benchmarks(quick=False):
+    """Run every benchmark and return a results document"""
+    repeat = 3 if quick else 5
+    results = {}
+    scratch = tempfile.mkdtemp(prefix="gas-bench-")
+    cwd = os.getcwd()
+    try:
+        # Trackers create metrics/ in the working directory
+        os.chdir(scratch)
+        bench_tracker(results, QUICK_HISTORY_SIZES if quick else HISTORY_SIZES, repeat)
+        bench_auto_init(results, repeat)
+        bench_mobile(results, repeat)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "quick": quick
+        },
+        "results": results
+    }
+
+
+def compare(current, baseline, tolerance):
+    """
+    Compare best per-call times against a baseline
+
+    Returns:
+        list: (name, baseline_us, current_us, ratio) for each regression
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        ratio = result["best_us"] / base["best_us"] if base["best_us"] else 1.0
+        if ratio > 1 + tolerance:
+            regressions.append((name, base["best_us"], result["best_us"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gas tracking benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="Fewer repeats and smaller histories")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Exit 1 if slower than baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown ratio (default 0.25)")
+    args = parser.parse_args()
+
+    document = run_benchmarks(quick=args.quick)
+
+    print(f"{'benchmark':<45} {'best us':>10} {'ops/sec':>14}")
+    for name, result in document["results"].items():
+        print(f"{name:<45} {result['best_us']:>10.2f} {result['ops_per_sec']:>14,.0f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nBaseline saved: {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+            return 2
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(document, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for name, base, current, ratio in regressions:
+                print(f"- {name}: {base:.2f}us -> {current:.2f}us ({ratio:.2f}x)")
+            return 1
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
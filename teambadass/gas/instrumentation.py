@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: instrumentation.py - Opt-in call counts and latency histograms
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: None (targets imported on enable)
+IMPORTED_BY: None
+
+TABLE_OF_CONTENTS:
+1. LatencyHistogram Class - Fixed log-spaced buckets in a preallocated array
+2. enable()/disable() - Wrap or restore public methods of target classes
+3. stats()/dump() - Snapshot of counts and latency percentiles, JSON dump hook
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Nothing is wrapped until enable() is called, so disabled instrumentation
+costs nothing: the classes keep their original methods.
+"""
+
+import json
+import atexit
+import inspect
+import importlib
+import functools
+from array import array
+from bisect import bisect_left
+from time import perf_counter_ns
+
+# Bucket upper bounds in nanoseconds: 1-2-5 steps from 100ns to 10s
+BUCKET_BOUNDS_NS = tuple(m * 10 ** e for e in range(2, 10) for m in (1, 2, 5)) + (10 ** 10,)
+
+DEFAULT_TARGETS = (
+    ("minimal_tracker", "MinimalTracker"),
+    ("auto_init", "AutoInit"),
+    ("mobile_integration", "MobileSession")
+)
+
+_histograms = {}
+_originals = {}
+_dump_path = None
+
+
+class LatencyHistogram:
+    """Call count and fixed-bucket latency histogram for one method"""
+
+    __slots__ = ("count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        # Last bucket catches anything slower than the largest bound
+        self.buckets = array("q", bytes(8 * (len(BUCKET_BOUNDS_NS) + 1)))
+
+    def record(self, elapsed_ns):
+        """Add one observation (no allocation beyond int arithmetic)"""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[bisect_left(BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+
+    def clear(self):
+        """Zero all counters in place"""
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        for i in range(len(self.buckets)):
+            self.buckets[i] = 0
+
+    def percentile(self, q):
+        """Upper bucket bound (ns) containing the q-quantile"""
+        if self.count == 0:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return BUCKET_BOUNDS_NS[i] if i < len(BUCKET_BOUNDS_NS) else self.max_ns
+        return self.max_ns
+
+    def summary(self):
+        """Compact report in microseconds"""
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_ns / self.count / 1000, 3) if self.count else 0,
+            "p50_us": self.percentile(0.5) / 1000,
+            "p99_us": self.percentile(0.99) / 1000,
+            "max_us": round(self.max_ns / 1000, 3),
+            "total_ms": round(self.total_ns / 1e6, 3)
+        }
+
+
+def enable(*classes, dump_path=None):
+    """
+    Start timing public methods of the given classes
+
+    Args:
+        *classes: Classes to instrument (MinimalTracker, AutoInit and
+            MobileSession when omitted)
+        dump_path (str): Write stats() here at interpreter exit
+
+    Returns:
+        list: Names of instrumented methods
+    """
+    global _dump_path
+    if not classes:
+        classes = [getattr(importlib.import_module(module), name) for module, name in DEFAULT_TARGETS]
+
+    names = []
+    for cls in classes:
+        for attr, func in list(vars(cls).items()):
+            if attr.startswith("_") or not inspect.isfunction(func):
+                continue
+            key = f"{cls.__name__}.{attr}"
+            if (cls, attr) not in _originals:
+                _originals[(cls, attr)] = func
+                histogram = _histograms.setdefault(key, LatencyHistogram())
+                setattr(cls, attr, _timed(func, histogram))
+            names.append(key)
+
+    if dump_path and _dump_path is None:
+        atexit.register(_dump_at_exit)
+    if dump_path:
+        _dump_path = dump_path
+    return names
+
+
+def disable():
+    """Restore every original method (collected stats are kept)"""
+    for (cls, attr), func in _originals.items():
+        setattr(cls, attr, func)
+    _originals.clear()
+
+
+def enabled():
+    """True while any method is instrumented"""
+    return bool(_originals)
+
+
+def stats():
+    """
+    Snapshot of collected timings
+
+    Returns:
+        dict: "Class.method" -> count, mean/p50/p99/max (us), total (ms)
+    """
+    return {key: histogram.summary() for key, histogram in _histograms.items() if histogram.count}
+
+
+def reset():
+    """Discard collected timings (live wrappers keep their histograms)"""
+    for histogram in _histograms.values():
+        histogram.clear()
+
+
+def dump(path):
+    """Write stats() to a JSON file"""
+    with open(path, "w") as f:
+        json.dump(stats(), f, indent=2)
+    return path
+
+
+def _timed(func, histogram):
+    """Wrap func so each call is recorded in histogram"""
+    record = histogram.record
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(perf_counter_ns() - start)
+
+    return wrapper
+
+
+def _dump_at_exit():
+    if _dump_path:
+        dump(_dump_path)
+
+
+# Example usage
+if __name__ == "__main__":
+    from minimal_tracker import MinimalTracker
+
+    enable(MinimalTracker)
+    tracker = MinimalTracker(silent=True)
+    for _ in range(10000):
+        tracker.register("code", "low", "small")
+        tracker.estimate("artifact", "high", "large")
+    tracker.check()
+    disable()
+
+    for name, summary in stats().items():
+        print(f"{name:<28} {summary['count']:>6} calls  mean {summary['mean_us']}us  p99 <= {summary['p99_us']}us")
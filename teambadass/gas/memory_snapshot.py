@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: memory_snapshot.py - Warm-start snapshot of loaded memory files
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: None
+IMPORTED_BY: auto_init.py
+
+TABLE_OF_CONTENTS:
+1. Format - Header with repo fingerprint, offset index, per-entry payloads
+2. write() - Whole blob built in memory, one write, atomic replace
+3. MemorySnapshot Class - mmap-backed mapping, entries decoded on first access
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Layout (all little-endian):
+    header      HEADER (magic, format version, marshal version,
+                repo fingerprint, entry count, index size)
+    index       per entry: u16 path length, path, ENTRY (payload offset,
+                payload length, source file size, payload crc32)
+    index crc   u32 over header + index
+    payloads    marshal-encoded parsed content, one per entry
+
+Opening only checks the header and index; each payload is checksummed
+and unmarshalled the first time its path is read. Payloads use marshal
+(faster to load than JSON), so a snapshot written by a Python with a
+different marshal version is treated as stale.
+"""
+
+import os
+import mmap
+import zlib
+import struct
+import marshal
+from collections.abc import Mapping
+
+SNAPSHOT_NAME = ".memory-snapshot.bin"
+MAGIC = b"GASM"
+FORMAT_VERSION = 1
+
+# magic, format version, marshal version, fingerprint, entry count, index size
+HEADER = struct.Struct("<4sHH16sII")
+NAME = struct.Struct("<H")
+# payload offset, payload length, source size, payload crc32
+ENTRY = struct.Struct("<QIII")
+CRC = struct.Struct("<I")
+
+
+def write(path, fingerprint, memory, sizes=None):
+    """
+    Write a snapshot of parsed memory files
+
+    Args:
+        path (str): Snapshot file
+        fingerprint (str): Hex repository digest the content belongs to
+        memory (dict): File path -> parsed content
+        sizes (dict): File path -> source size in bytes (for reporting)
+
+    Returns:
+        int: Bytes written
+    """
+    sizes = sizes or {}
+    payloads = [(name, marshal.dumps(content)) for name, content in memory.items()]
+    index = bytearray()
+    offset = 0
+    for name, payload in payloads:
+        encoded = name.encode("utf-8")
+        index += NAME.pack(len(encoded))
+        index += encoded
+        index += ENTRY.pack(offset, len(payload), sizes.get(name, 0), zlib.crc32(payload))
+        offset += len(payload)
+
+    buffer = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, marshal.version, bytes.fromhex(fingerprint),
+                                   len(payloads), len(index)))
+    buffer += index
+    buffer += CRC.pack(zlib.crc32(buffer))
+    for _, payload in payloads:
+        buffer += payload
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(buffer)
+    os.replace(tmp_path, path)
+    return len(buffer)
+
+
+class MemorySnapshot(Mapping):
+    """Read-only path -> parsed content mapping over an mmapped snapshot"""
+
+    def __init__(self, mapped, fingerprint, index, base, paths=None):
+        self._mapped = mapped
+        self.fingerprint = fingerprint
+        self._index = index
+        self._base = base
+        # Ordered set of the paths this view exposes
+        self._paths = dict.fromkeys(index if paths is None else (path for path in paths if path in index))
+        self._decoded = {}
+
+    @classmethod
+    def open(cls, path):
+        """
+        Map a snapshot and parse its index
+
+        Raises:
+            OSError: Snapshot missing or unreadable
+            ValueError: Wrong magic, unsupported version or failed checksum
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size + CRC.size:
+                raise ValueError("Snapshot truncated")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, marshal_version, fingerprint, count, index_size = HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC:
+                raise ValueError("Not a memory snapshot")
+            if version != FORMAT_VERSION or marshal_version != marshal.version:
+                raise ValueError(f"Unsupported snapshot version: {version}/{marshal_version}")
+            end = HEADER.size + index_size
+            if len(mapped) < end + CRC.size:
+                raise ValueError("Snapshot truncated")
+            with memoryview(mapped) as view:
+                if zlib.crc32(view[:end]) != CRC.unpack_from(mapped, end)[0]:
+                    raise ValueError("Snapshot checksum mismatch")
+
+            index = {}
+            offset = HEADER.size
+            for _ in range(count):
+                (length,) = NAME.unpack_from(mapped, offset)
+                offset += NAME.size
+                name = mapped[offset:offset + length].decode("utf-8")
+                offset += length
+                index[name] = ENTRY.unpack_from(mapped, offset)
+                offset += ENTRY.size
+        except (ValueError, struct.error, UnicodeDecodeError) as e:
+            mapped.close()
+            raise ValueError(f"Corrupt memory snapshot: {e}") from e
+        return cls(mapped, fingerprint.hex(), index, end + CRC.size)
+
+    def select(self, paths):
+        """View limited to the given paths, sharing the mapping and decoded entries"""
+        view = MemorySnapshot(self._mapped, self.fingerprint, self._index, self._base, paths)
+        view._decoded = self._decoded
+        return view
+
+    def source_size(self, path):
+        """Size in bytes of the file the entry was loaded from"""
+        return self._index[path][2]
+
+    def __getitem__(self, path):
+        if path not in self._paths:
+            raise KeyError(path)
+        try:
+            return self._decoded[path]
+        except KeyError:
+            pass
+        offset, length, _, crc = self._index[path]
+        start = self._base + offset
+        payload = self._mapped[start:start + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            raise ValueError(f"Snapshot entry corrupt: {path}")
+        content = self._decoded[path] = marshal.loads(payload)
+        return content
+
+    def __contains__(self, path):
+        return path in self._paths
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def close(self):
+        """Release the mapping (decoded entries stay usable; others raise ValueError)"""
+        self._mapped.close()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for metrics_log.py crash recovery
+
+Simulates a crash between writing the first record of a new segment and
+publishing the manifest that names it, then checks that a fresh log
+instance recovers the record and keeps appending line-aligned. Also
+checks that a failed manifest write does not make the tracker resend
+an operation it already appended.
+"""
+
+import shutil
+import tempfile
+
+from metrics_log import SegmentedMetricsLog
+from minimal_tracker import MinimalTracker
+
+
+class CrashError(Exception):
+    """Stands in for the process dying mid-append"""
+
+
+def record(number):
+    """Minimal session record with a one-op delta"""
+    return {"session_id": f"s{number}", "thresholds": {"warning": 60.0, "hard_stop": 90.0}}
+
+
+def run_test():
+    print("Testing metrics_log.py rollover recovery...")
+    directory = tempfile.mkdtemp()
+    delta = {"code": {"count": 1, "total_cost": 2.0}}
+    try:
+        log = SegmentedMetricsLog(directory, segment_records=2)
+        log.append(record(1), delta)
+        log.append(record(2), delta)
+
+        # Crash after record 3 lands in segment 2, before the manifest update
+        def crash(manifest):
+            raise CrashError()
+        log._write_manifest = crash
+        try:
+            log.append(record(3), delta)
+        except CrashError:
+            pass
+
+        print("- Reopening after crash at rollover")
+        log = SegmentedMetricsLog(directory, segment_records=2)
+        summary = log.summary()
+        assert summary["operations"]["code"]["count"] == 3, summary["operations"]
+        assert [s["session_id"] for s in summary["sessions"]] == ["s1", "s2", "s3"]
+
+        print("- Appending after recovery")
+        log.append(record(4), delta)
+        log.append(record(5), delta)
+        log = SegmentedMetricsLog(directory, segment_records=2)
+        summary = log.summary()
+        assert summary["operations"]["code"]["count"] == 5, summary["operations"]
+        assert [r["session_id"] for r in log.records()] == ["s1", "s2", "s3", "s4", "s5"]
+        assert log.manifest["segment"] == 3 and log.manifest["records"] == 1, log.manifest
+    finally:
+        shutil.rmtree(directory)
+
+    print("- Saving while the manifest cannot be written")
+    directory = tempfile.mkdtemp()
+    try:
+        tracker = MinimalTracker(silent=True, metrics_store=SegmentedMetricsLog(directory))
+        write_manifest = tracker.metrics_log._write_manifest
+
+        def full_disk(manifest):
+            raise OSError("No space left on device")
+        tracker.metrics_log._write_manifest = full_disk
+        tracker.register("code", "low", "small")
+        assert tracker.save_metrics()["status"] == "success"
+
+        # The next save must send only the new operation, not resend the first
+        tracker.metrics_log._write_manifest = write_manifest
+        tracker.register("code", "low", "small")
+        tracker.save_metrics()
+        summary = SegmentedMetricsLog(directory).summary()
+        assert summary["operations"]["code"]["count"] == 2, summary["operations"]
+    finally:
+        shutil.rmtree(directory)
+
+    print("\nTest completed successfully!")
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: metrics_exporter.py - OpenMetrics endpoint for live tracker state
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: unix_socket.py, http.server, socketserver (standard library)
+IMPORTED_BY: None
+
+TABLE_OF_CONTENTS:
+1. OpenMetricsExporter Class - Serves registered trackers/pools from a daemon thread
+2. Snapshot Cache - Per-source samples rebuilt only when the source's version changes
+3. Rendering - OpenMetrics text exposition (families grouped, terminated by # EOF)
+4. Transports - Loopback HTTP or a Unix domain socket
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Scrapes only read `version` and, when it moved, copy the source's
+state; they never take a tracker lock, so register() is not slowed
+down by a scraper. Session age is the only value computed per scrape
+(from the cached start time).
+"""
+
+import time
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from unix_socket import claim_socket_path, release_socket_path, socket_identity
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# (name, type, help) in exposition order
+FAMILIES = (
+    ("gas_tracker_usage_percent", "gauge", "Session capacity used"),
+    ("gas_tracker_threshold_percent", "gauge", "Configured capacity thresholds"),
+    ("gas_tracker_threshold_crossed", "gauge", "1 once the session crossed the threshold"),
+    ("gas_tracker_operations", "counter", "Operations registered by type"),
+    ("gas_tracker_operation_cost", "counter", "Capacity consumed by type"),
+    ("gas_tracker_session_age_seconds", "gauge", "Seconds since the session started"),
+    ("gas_pool_sessions", "gauge", "Hosted sessions by status"),
+    ("gas_pool_threshold_crossed_sessions", "gauge", "Hosted sessions that crossed each threshold"),
+    ("gas_pool_operations", "gauge", "Operations registered by open sessions, by type"),
+    ("gas_pool_operation_cost", "gauge", "Capacity consumed by open sessions, by type"),
+    ("gas_pool_oldest_session_age_seconds", "gauge", "Age of the longest-running hosted session")
+)
+
+AGE_FAMILIES = {
+    "tracker": "gas_tracker_session_age_seconds",
+    "pool": "gas_pool_oldest_session_age_seconds"
+}
+
+
+class OpenMetricsExporter:
+    """Exposes MinimalTracker and TrackerPool state for a local scraper"""
+
+    def __init__(self, host="127.0.0.1", port=9464, unix_socket=None):
+        """
+        Configure the exporter (nothing is bound until start())
+
+        Args:
+            host (str): HTTP bind address (loopback by default)
+            port (int): HTTP port (0 picks a free one)
+            unix_socket (str): Serve on this Unix socket path instead of TCP
+        """
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.render_count = 0
+
+        self._sources = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._socket_identity = None
+
+    def add_tracker(self, tracker, name=None):
+        """
+        Export a MinimalTracker (or ConcurrentTracker)
+
+        Args:
+            tracker (MinimalTracker): Tracker to expose
+            name (str): `tracker` label value (defaults to the session ID)
+
+        Returns:
+            str: Label value used
+        """
+        name = name or tracker.session_id
+        with self._lock:
+            self._sources[name] = ("tracker", tracker)
+            self._cache.pop(name, None)
+        return name
+
+    def add_pool(self, pool, name="pool"):
+        """Export aggregate state of a TrackerPool under the `pool` label"""
+        with self._lock:
+            self._sources[name] = ("pool", pool)
+            self._cache.pop(name, None)
+        return name
+
+    def remove(self, name):
+        """Stop exporting a source"""
+        with self._lock:
+            self._sources.pop(name, None)
+            self._cache.pop(name, None)
+
+    def render(self):
+        """
+        OpenMetrics exposition of every registered source
+
+        Returns:
+            str: Text body, terminated by "# EOF"
+        """
+        now = time.time()
+        with self._lock:
+            snapshots = [(name, kind, self._snapshot(name, kind, source))
+                         for name, (kind, source) in self._sources.items()]
+            self.render_count += 1
+
+        lines = []
+        for family, metric_type, help_text in FAMILIES:
+            samples = []
+            for name, kind, (_, families, start) in snapshots:
+                if family == AGE_FAMILIES[kind]:
+                    if start is not None:
+                        samples.append(_sample(family, {kind: name}, max(now - start, 0.0)))
+                else:
+                    samples.extend(families.get(family, ()))
+            if samples:
+                lines.append(f"# TYPE {family} {metric_type}")
+                lines.append(f"# HELP {family} {help_text}")
+                lines.extend(samples)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def start(self):
+        """Bind and serve from a daemon thread"""
+        if self._server is not None:
+            return self
+        if self.unix_socket:
+            # Raises if another exporter is listening or the path is not a socket
+            claim_socket_path(self.unix_socket, "Metrics exporter")
+            server = _UnixHTTPServer(self.unix_socket, _MetricsHandler)
+            self._socket_identity = socket_identity(self.unix_socket)
+        else:
+            server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+            self.port = server.server_address[1]
+        server.exporter = self
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="openmetrics-exporter", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down and release the socket"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+        if self.unix_socket:
+            # Only remove the socket this exporter bound
+            release_socket_path(self.unix_socket, self._socket_identity)
+            self._socket_identity = None
+
+    @property
+    def address(self):
+        """Where the exporter is listening (URL or socket path)"""
+        if self.unix_socket:
+            return self.unix_socket
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def _snapshot(self, name, kind, source):
+        """Cached (version, family samples, start epoch); rebuilt on version change"""
+        version = source.version
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == version:
+            return cached
+        if kind == "tracker":
+            families, start = _tracker_samples(name, source)
+        else:
+            families, start = _pool_samples(name, source)
+        cached = self._cache[name] = (version, families, start)
+        return cached
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def _tracker_samples(name, tracker):
+    """Sample lines for one tracker, grouped by family"""
+    labels = {"tracker": name}
+    thresholds = dict(tracker.thresholds)
+    observed = {"warning": tracker.warning_observed, "hard_stop": tracker.hard_stop_observed}
+    operations = sorted(tracker.operations.items())
+
+    families = {
+        "gas_tracker_usage_percent": [_sample("gas_tracker_usage_percent", labels, tracker.usage)],
+        "gas_tracker_threshold_percent": [
+            _sample("gas_tracker_threshold_percent", {**labels, "threshold": level}, thresholds[level])
+            for level in ("warning", "hard_stop")
+        ],
+        "gas_tracker_threshold_crossed": [
+            _sample("gas_tracker_threshold_crossed", {**labels, "threshold": level}, int(observed[level]))
+            for level in ("warning", "hard_stop")
+        ],
+        "gas_tracker_operations": [
+            _sample("gas_tracker_operations_total", {**labels, "op_type": op_type}, data["count"])
+            for op_type, data in operations
+        ],
+        "gas_tracker_operation_cost": [
+            _sample("gas_tracker_operation_cost_total", {**labels, "op_type": op_type}, data["total_cost"])
+            for op_type, data in operations
+        ]
+    }
+    return families, tracker.start_time.timestamp()
+
+
+def _pool_samples(name, pool):
+    """Aggregate sample lines for one TrackerPool, grouped by family"""
+    labels = {"pool": name}
+    operations = sorted(pool.operation_totals().items())
+
+    families = {
+        "gas_pool_sessions": [
+            _sample("gas_pool_sessions", {**labels, "status": status.lower()}, count)
+            for status, count in pool.status_counts().items()
+        ],
+        "gas_pool_threshold_crossed_sessions": [
+            _sample("gas_pool_threshold_crossed_sessions", {**labels, "threshold": level}, count)
+            for level, count in pool.crossing_counts().items()
+        ],
+        "gas_pool_operations": [
+            _sample("gas_pool_operations", {**labels, "op_type": op_type}, data["count"])
+            for op_type, data in operations
+        ],
+        "gas_pool_operation_cost": [
+            _sample("gas_pool_operation_cost", {**labels, "op_type": op_type}, data["total_cost"])
+            for op_type, data in operations
+        ]
+    }
+    return families, pool.oldest_start()
+
+
+def _sample(metric, labels, value):
+    """One exposition line: metric{label="value",...} number"""
+    rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    number = repr(float(value)) if isinstance(value, float) else str(value)
+    return f"{metric}{{{rendered}}} {number}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics (or /) returns the exporter's rendering"""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are frequent; keep them out of the session log
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+# Example usage
+if __name__ == "__main__":
+    from minimal_tracker import MinimalTracker
+
+    tracker = MinimalTracker(silent=True)
+    tracker.register("code", "high", "large")
+    tracker.register("discuss")
+    with OpenMetricsExporter(port=0) as exporter:
+        exporter.add_tracker(tracker, name="example")
+        print(f"Serving {exporter.address}")
+        print(exporter.render())
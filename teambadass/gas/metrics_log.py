@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: metrics_log.py - Append-only segmented session metrics log
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: quantile_sketch.py (imported lazily)
+IMPORTED_BY: minimal_tracker.py
+
+TABLE_OF_CONTENTS:
+1. SegmentedMetricsLog Class - One compact JSON line per saved session
+2. Manifest - Small atomically replaced file with the incremental summary
+3. Recovery - Replay of records written after the last manifest update
+4. Legacy Import - Seeding the summary from capacity_metrics.json
+5. Multi-writer Mode - Advisory file lock around reload, append and manifest update
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+"""
+
+import os
+import copy
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger("MinimalTracker")
+
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".lock"
+SEGMENT_RECORDS = 1000
+RECENT_SESSIONS = 10
+RECENT_THRESHOLDS = 20
+
+# none: rely on OS buffers; fsync: fsync each appended batch;
+# atomic: also fsync the manifest and its directory around the rename
+DURABILITY_LEVELS = ("none", "fsync", "atomic")
+
+
+class SegmentedMetricsLog:
+    """Append-only session log with fixed-size segments and a summary manifest"""
+
+    def __init__(self, directory="metrics", segment_records=SEGMENT_RECORDS, legacy_file=None, durability="none",
+                 multi_writer=True):
+        """
+        Open (or create) a metrics log in the given directory
+
+        Args:
+            directory (str): Directory holding segments and the manifest
+            segment_records (int): Number of records per segment file
+            legacy_file (str): Old capacity_metrics.json used to seed a new log
+            durability (str): One of DURABILITY_LEVELS
+            multi_writer (bool): Serialize with other processes through an
+                advisory lock on <directory>/.lock
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability: {durability}")
+        self.directory = directory
+        self.segment_records = segment_records
+        self.legacy_file = legacy_file
+        self.durability = durability
+        self.multi_writer = multi_writer
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.lock_path = os.path.join(directory, LOCK_NAME)
+        self.manifest = None
+        self._manifest_stat = None
+        self._lock = threading.Lock()
+
+    def append(self, record, op_delta):
+        """
+        Append a session record and fold it into the summary
+
+        Args:
+            record (dict): Session record (written as one compact line)
+            op_delta (dict): Per-op counts/costs not yet reflected in the summary
+
+        Returns:
+            str: Path of the segment the record was written to
+        """
+        with self._lock, self._process_lock():
+            return self._append(record, op_delta)
+
+    def _append(self, record, op_delta):
+        """Append under the instance lock"""
+        manifest = self._load_manifest()
+        while manifest["records"] >= self.segment_records:
+            manifest["segment"] += 1
+            manifest["records"] = 0
+            manifest["offset"] = 0
+            # A writer that crashed before publishing the rollover may have
+            # already started this segment: replay it before appending
+            self._recover_tail(manifest)
+
+        record = dict(record, delta=op_delta)
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        path = self._segment_path(manifest["segment"])
+        with open(path, "ab") as f:
+            f.write(line)
+            if self.durability != "none":
+                f.flush()
+                os.fsync(f.fileno())
+
+        manifest["records"] += 1
+        manifest["offset"] += len(line)
+        manifest["total_records"] += 1
+        self._apply(manifest["summary"], record)
+        try:
+            self._write_manifest(manifest)
+        except OSError as e:
+            # The record is in the segment and recovery replays it, so the
+            # append succeeded; failing here would make callers resend it
+            logger.warning(f"Metrics manifest not updated (recovered on next load): {e}")
+        return path
+
+    def summary(self):
+        """
+        Return rollups in the shape of the old capacity_metrics.json
+
+        Returns:
+            dict: sessions, thresholds, operations, sketches, avg_warning, avg_hard_stop
+        """
+        with self._lock, self._process_lock():
+            summary = self._load_manifest()["summary"]
+        # Entries carry the session they belong to; callers see the old shape.
+        # Sessions nest operations and thresholds, so copy deeply: edits to
+        # the result must not reach the cached manifest the next append writes
+        thresholds = [{"warning": t["warning"], "hard_stop": t["hard_stop"]} for t in summary["thresholds"]]
+        result = {
+            "sessions": copy.deepcopy(summary["sessions"]),
+            "thresholds": thresholds,
+            "operations": copy.deepcopy(summary["operations"]),
+            "sketches": copy.deepcopy(summary.get("sketches", {}))
+        }
+        if thresholds:
+            count = len(thresholds)
+            result["avg_warning"] = sum(t["warning"] for t in thresholds) / count
+            result["avg_hard_stop"] = sum(t["hard_stop"] for t in thresholds) / count
+        return result
+
+    def records(self):
+        """Iterate over every complete record in the log, oldest first"""
+        with self._lock, self._process_lock():
+            manifest = self._load_manifest()
+        for segment in range(1, manifest["segment"] + 1):
+            path = self._segment_path(segment)
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as f:
+                for line in f:
+                    if line.endswith(b"\n"):
+                        yield json.loads(line)
+
+    def _apply(self, summary, record):
+        """Fold one record into the incremental summary"""
+        for op_type, data in record.get("delta", {}).items():
+            totals = summary["operations"].setdefault(op_type, {"count": 0, "total_cost": 0})
+            totals["count"] += data["count"]
+            totals["total_cost"] += data["total_cost"]
+            if "sketch" in data:
+                from quantile_sketch import CostSketch
+                merged = CostSketch.from_dict(data["sketch"])
+                if op_type in summary.setdefault("sketches", {}):
+                    merged.merge(CostSketch.from_dict(summary["sketches"][op_type]))
+                summary["sketches"][op_type] = merged.to_dict()
+
+        # Recent sessions are kept without their (already merged) sketches
+        session = {k: v for k, v in record.items() if k not in ("delta", "sketches")}
+        sessions = [s for s in summary["sessions"] if s.get("session_id") != session.get("session_id")]
+        sessions.append(session)
+        summary["sessions"] = sessions[-RECENT_SESSIONS:]
+
+        # One thresholds entry per session: repeated saves (write-behind
+        # flushes) replace it instead of crowding out other sessions
+        session_id = record.get("session_id")
+        entry = dict(record["thresholds"], session_id=session_id)
+        thresholds = [t for t in summary["thresholds"] if session_id is None or t.get("session_id") != session_id]
+        thresholds.append(entry)
+        summary["thresholds"] = thresholds[-RECENT_THRESHOLDS:]
+
+    @contextmanager
+    def _process_lock(self):
+        """Exclusive advisory lock shared by every process using this directory"""
+        if not self.multi_writer:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl:
+                # Released when the descriptor is closed
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+                return
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10s of contention
+                    time.sleep(0.01)
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def _load_manifest(self):
+        """Load the manifest, recovering any records it has not seen"""
+        # Reuse the cached copy unless another writer has replaced the file
+        if self.manifest is not None and self._stat_manifest() == self._manifest_stat:
+            if self.multi_writer:
+                # Records another process appended but crashed before publishing
+                self._recover_tail(self.manifest)
+            return self.manifest
+
+        os.makedirs(self.directory, exist_ok=True)
+        manifest = None
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r") as f:
+                    manifest = json.load(f)
+            except ValueError:
+                manifest = None
+
+        if manifest is None:
+            manifest = self._new_manifest()
+            self._rebuild(manifest)
+        else:
+            self._recover_tail(manifest)
+
+        self.manifest = manifest
+        self._manifest_stat = self._stat_manifest()
+        return manifest
+
+    def _stat_manifest(self):
+        """Identity of the manifest file on disk (changes on every replace)"""
+        try:
+            st = os.stat(self.manifest_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _new_manifest(self):
+        """Create an empty manifest, seeded from the legacy file if present"""
+        summary = {"sessions": [], "thresholds": [], "operations": {}}
+        if self.legacy_file and os.path.exists(self.legacy_file):
+            try:
+                with open(self.legacy_file, "r") as f:
+                    legacy = json.load(f)
+                summary["sessions"] = legacy.get("sessions", [])[-RECENT_SESSIONS:]
+                summary["thresholds"] = legacy.get("thresholds", [])[-RECENT_THRESHOLDS:]
+                summary["operations"] = legacy.get("operations", {})
+            except ValueError:
+                pass
+
+        return {
+            "version": 1,
+            "segment": 1,
+            "records": 0,
+            "offset": 0,
+            "total_records": 0,
+            "summary": summary
+        }
+
+    def _rebuild(self, manifest):
+        """Rebuild a lost or corrupt manifest by replaying every segment"""
+        self._recover_tail(manifest)
+        if manifest["total_records"]:
+            self._write_manifest(manifest)
+
+    def _recover_tail(self, manifest):
+        """Replay records appended after the manifest was last written"""
+        while True:
+            self._replay_segment(manifest)
+            # Later segments exist when a writer rolled over but crashed
+            # before the manifest naming the new segment was written
+            if not os.path.exists(self._segment_path(manifest["segment"] + 1)):
+                return
+            manifest["segment"] += 1
+            manifest["records"] = 0
+            manifest["offset"] = 0
+
+    def _replay_segment(self, manifest):
+        """Replay the manifest's segment from its recorded offset"""
+        path = self._segment_path(manifest["segment"])
+        if not os.path.exists(path) or os.path.getsize(path) <= manifest["offset"]:
+            return
+
+        with open(path, "rb+") as f:
+            f.seek(manifest["offset"])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Torn write from a crash: drop it so appends stay line-aligned
+                    f.truncate(manifest["offset"])
+                    break
+                self._apply(manifest["summary"], json.loads(line))
+                manifest["records"] += 1
+                manifest["offset"] += len(line)
+                manifest["total_records"] += 1
+
+    def _write_manifest(self, manifest):
+        """Replace the manifest atomically so readers never see a partial file"""
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+            if self.durability == "atomic":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_stat = self._stat_manifest()
+
+        if self.durability == "atomic" and hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _segment_path(self, segment):
+        """Path of the numbered segment file"""
+        return os.path.join(self.directory, f"segment-{segment:06d}.jsonl")
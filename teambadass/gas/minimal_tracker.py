@@ -3,13 +3,14 @@
 FILE_OVERVIEW: minimal_tracker.py - Ultra-efficient session capacity tracker
 VERSION: 2.0.0
 LAST_UPDATED: 2025-05-02
-DEPENDENCIES: None
+DEPENDENCIES: cost_model.py, metrics_log.py, capacity_status.py; quantile_sketch.py, event_ring.py,
+    snapshot.py, capacity_planner.py (imported lazily)
 IMPORTED_BY: init.py, auto_init.js
 
 TABLE_OF_CONTENTS:
 1. MinimalTracker Class - Core capacity tracking with silent operation
-2. Operation Registration - Threshold-based operation tracking
-3. Metrics Collection - Consolidated JSON metrics storage
+2. Operation Registration - Threshold-based operation tracking (single and batch)
+3. Metrics Collection - Append-only segmented metrics log
 4. Status Reporting - Minimal output with essential information
 5. Command Integration - Direct integration with auto-init.js
 
@@ -17,36 +18,88 @@ SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
 """
 
 import os
-import json
 import time
+import operator
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import reduce
+from itertools import accumulate, count, repeat
 from datetime import datetime
 import logging
 
-# Configure minimal logging
-logging.basicConfig(level=logging.INFO, format='%(message)s')
+from capacity_status import RECOMMENDATIONS, usage_status
+from cost_model import CostModel
+from metrics_log import SegmentedMetricsLog
+
+# capacity_planner, event_ring, quantile_sketch and snapshot are imported
+# where first needed so importing the tracker stays cheap
+
 logger = logging.getLogger("MinimalTracker")
 
+_session_counter = count(1)
+
+ESTIMATE_CACHE_SIZE = 256
+
+
+def new_session_id():
+    """Session ID unique across processes and sessions started in the same second"""
+    return f"session-{int(time.time())}-{os.getpid()}-{next(_session_counter)}"
+
+
 class MinimalTracker:
     """Ultra-minimal session capacity tracking with silent operation"""
     
-    def __init__(self, silent=True):
-        """Initialize tracker with optional silent mode"""
+    def __init__(self, silent=True, cost_model=None, metrics_store=None):
+        """
+        Initialize tracker with optional silent mode, cost model and metrics store
+        
+        Args:
+            silent (bool): Only report threshold crossings via return values
+            cost_model (CostModel): Cost model (defaults to cost_model.json)
+            metrics_store: Persistence backend with append()/summary()
+                (defaults to the segmented log in metrics/)
+        """
+        if not silent:
+            # Reported messages need a handler; configured here rather than at
+            # import so importing the tracker stays cheap (no-op if configured)
+            logging.basicConfig(level=logging.INFO, format='%(message)s')
         self.usage = 0.0
         self.thresholds = {"warning": 60.0, "hard_stop": 90.0}
+        self._cost_model = cost_model or CostModel.load()
         self.operations = {}
-        self.metrics_file = "capacity_metrics.json"
+        self.sketches = {}
+        self.history_sketches = None
+        self.events = None
+        self.metrics_dir = "metrics"
+        if metrics_store is None:
+            # Ensure metrics directory exists
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            metrics_store = SegmentedMetricsLog(self.metrics_dir, legacy_file="capacity_metrics.json")
+        self.metrics_log = metrics_store
+        self._saved_operations = {}
+        self._saved_sketches = {}
         self.start_time = datetime.now()
-        self.session_id = f"session-{int(time.time())}"
+        self.session_id = new_session_id()
         self.silent = silent
         
+        # Change tracking for write-behind persistence
+        self.version = 0
+        self.on_change = None
+        self._write_lock = threading.Lock()
+        
+        # estimate() memoization: LRU of computed costs
+        self._estimate_cache = OrderedDict()
+        self._estimate_cache_size = ESTIMATE_CACHE_SIZE
+        self._estimate_hits = 0
+        self._estimate_misses = 0
+        self._bands_cache = {}
+        
         # Observable indicators
         self.warning_observed = False
         self.warning_time = None
         self.hard_stop_observed = False
         self.hard_stop_time = None
-        
-        # Ensure metrics directory exists
-        os.makedirs("metrics", exist_ok=True)
     
     def register(self, op_type, complexity=None, size=None):
         """Register operation with silent threshold detection"""
@@ -60,17 +113,21 @@ class MinimalTracker:
         self.operations[op_type]["count"] += 1
         self.operations[op_type]["total_cost"] += cost
         
+        # Record cost distribution
+        sketch = self.sketches.get(op_type)
+        if sketch is None:
+            from quantile_sketch import CostSketch
+            sketch = self.sketches[op_type] = CostSketch()
+        sketch.add(cost)
+        
         # Check thresholds
-        message = None
-        if pre_usage < self.thresholds["warning"] and self.usage >= self.thresholds["warning"]:
-            self.warning_observed = True
-            self.warning_time = datetime.now()
-            message = f"⚠️ Session at {self.usage:.1f}% capacity"
-            
-        elif pre_usage < self.thresholds["hard_stop"] and self.usage >= self.thresholds["hard_stop"]:
-            self.hard_stop_observed = True
-            self.hard_stop_time = datetime.now()
-            message = f"🛑 Session at {self.usage:.1f}% capacity - critical"
+        crossing = self._threshold_crossing(pre_usage, self.usage)
+        message = self._crossing_message(crossing, self.usage) if crossing else None
+        
+        if self.events is not None:
+            self.events.record(op_type, cost, self.usage, crossing)
+        
+        self._mark_changed()
         
         # Only output if not silent or threshold crossed
         if message and not self.silent:
@@ -78,90 +135,334 @@ class MinimalTracker:
             
         return message
     
-    def _calculate_cost(self, op_type, complexity=None, size=None):
-        """Calculate operation cost with full operation matrix"""
-        costs = {
-            "context": {"base": 2.0, "per_kb": 0.05},
-            "code": {"base": 3.0, "complexity": {"low": 1.0, "medium": 2.0, "high": 4.0}, 
-                     "size": {"small": 1.0, "medium": 2.5, "large": 5.0}},
-            "discuss": {"base": 1.0, "per_word": 0.01},
-            "search": {"base": 4.0, "per_result": 0.5},
-            "artifact": {"base": 5.0, "complexity": {"low": 1.0, "medium": 2.0, "high": 3.5}, 
-                         "size": {"small": 1.0, "medium": 2.0, "large": 4.0}},
-            "plan": {"base": 2.0, "complexity": {"low": 1.0, "medium": 2.0, "high": 3.0}}
-        }
-        
-        complexity = complexity or "medium"
-        size = size or "medium"
+    def _mark_changed(self):
+        """Bump the state version and notify any change listener"""
+        self.version += 1
+        if self.on_change:
+            self.on_change(self)
+    
+    def _threshold_crossing(self, pre_usage, usage):
+        """Threshold ("warning"/"hard_stop") crossed between two usage levels, if any"""
+        if pre_usage < self.thresholds["warning"] and usage >= self.thresholds["warning"]:
+            return "warning"
+        elif pre_usage < self.thresholds["hard_stop"] and usage >= self.thresholds["hard_stop"]:
+            return "hard_stop"
+        return None
+    
+    def _crossing_message(self, crossing, usage):
+        """Mark a crossing as observed and build its message"""
+        if crossing == "warning":
+            self.warning_observed = True
+            self.warning_time = datetime.now()
+            return f"⚠️ Session at {usage:.1f}% capacity"
+        self.hard_stop_observed = True
+        self.hard_stop_time = datetime.now()
+        return f"🛑 Session at {usage:.1f}% capacity - critical"
+    
+    def enable_events(self, capacity=4096):
+        """
+        Start recording each registered operation in an EventRing
         
-        if op_type == "context":
-            kb = size if isinstance(size, (int, float)) else 50
-            return costs["context"]["base"] + (costs["context"]["per_kb"] * kb)
-            
-        elif op_type in ["code", "artifact"]:
-            c_factor = costs[op_type]["complexity"].get(complexity, costs[op_type]["complexity"]["medium"])
-            s_factor = costs[op_type]["size"].get(size, costs[op_type]["size"]["medium"])
-            return costs[op_type]["base"] * c_factor * s_factor
+        Args:
+            capacity (int): Most recent events to keep
             
-        elif op_type == "discuss":
-            words = size if isinstance(size, (int, float)) else 200
-            return costs["discuss"]["base"] + (costs["discuss"]["per_word"] * words)
-            
-        elif op_type == "search":
-            results = complexity if isinstance(complexity, (int, float)) else 5
-            return costs["search"]["base"] + (costs["search"]["per_result"] * results)
-            
-        elif op_type == "plan":
-            c_factor = costs["plan"]["complexity"].get(complexity, costs["plan"]["complexity"]["medium"])
-            return costs["plan"]["base"] * c_factor
+        Returns:
+            EventRing: The ring (also available as self.events)
+        """
+        if self.events is None or self.events.capacity != capacity:
+            from event_ring import EventRing
+            self.events = EventRing(capacity)
+        return self.events
+    
+    def timeline(self, title="Operation Timeline"):
+        """tracking.md-style markdown timeline of recorded events (None if not enabled)"""
+        if self.events is None:
+            return None
+        return self.events.to_markdown(self.thresholds, title)
+    
+    def register_many(self, op_types, complexities=None, sizes=None):
+        """
+        Register a batch of operations given as columns
+        
+        Produces exactly the state and threshold messages of calling
+        register() for each row in order.
+        
+        Args:
+            op_types (list): Operation type per row
+            complexities (list): Complexity per row (None for all defaults)
+            sizes (list): Size per row (None for all defaults)
             
-        # Default fallback
-        return 3.0
+        Returns:
+            list: (row index, message) for each threshold crossing
+        """
+        costs = self._calculate_costs(op_types, complexities, sizes)
+        if not costs:
+            return []
+        
+        start = self.usage
+        cumulative = list(accumulate(costs, initial=start))[1:]
+        
+        # Per-op totals, summed in row order to match sequential register()
+        grouped = {}
+        for op_type, cost in zip(op_types, costs):
+            grouped.setdefault(op_type, []).append(cost)
+        for op_type, op_costs in grouped.items():
+            self._add_op_costs(op_type, op_costs)
+        
+        self.usage = cumulative[-1]
+        crossings = self._find_crossings(start, cumulative, min(costs) >= 0)
+        self._mark_changed()
+        
+        if self.events is not None:
+            kinds = dict(crossings)
+            for index, (op_type, cost, usage) in enumerate(zip(op_types, costs, cumulative)):
+                self.events.record(op_type, cost, usage, kinds.get(index))
+        
+        messages = []
+        for index, kind in crossings:
+            message = self._crossing_message(kind, cumulative[index])
+            if not self.silent:
+                logger.info(message)
+            messages.append((index, message))
+        
+        return messages
+    
+    def _add_op_costs(self, op_type, op_costs):
+        """Add a run of costs for one op type to its totals"""
+        if op_type not in self.operations:
+            self.operations[op_type] = {"count": 0, "total_cost": 0}
+        self.operations[op_type]["count"] += len(op_costs)
+        self.operations[op_type]["total_cost"] = reduce(
+            operator.add, op_costs, self.operations[op_type]["total_cost"])
+        self._add_sketch_costs(op_type, op_costs)
+    
+    def _add_sketch_costs(self, op_type, op_costs):
+        """Add a run of costs to the op type's distribution sketch"""
+        sketch = self.sketches.get(op_type)
+        if sketch is None:
+            from quantile_sketch import CostSketch
+            sketch = self.sketches[op_type] = CostSketch()
+        for cost in op_costs:
+            sketch.add(cost)
+    
+    def _find_crossings(self, start, cumulative, monotonic):
+        """Locate rows where register() would report a threshold crossing"""
+        warning = self.thresholds["warning"]
+        hard_stop = self.thresholds["hard_stop"]
+        
+        if not monotonic:
+            # Negative costs: usage can dip and recross, so scan every row
+            crossings = []
+            pre = start
+            for index, usage in enumerate(cumulative):
+                if pre < warning and usage >= warning:
+                    crossings.append((index, "warning"))
+                elif pre < hard_stop and usage >= hard_stop:
+                    crossings.append((index, "hard_stop"))
+                pre = usage
+            return crossings
+        
+        # Non-decreasing usage crosses each threshold at most once
+        crossings = []
+        warning_index = None
+        if start < warning:
+            warning_index = bisect_left(cumulative, warning)
+            if warning_index < len(cumulative):
+                crossings.append((warning_index, "warning"))
+        if start < hard_stop:
+            hard_index = bisect_left(cumulative, hard_stop)
+            if hard_index < len(cumulative):
+                pre = cumulative[hard_index - 1] if hard_index else start
+                # register() checks warning first, so a row crossing both reports only the warning
+                if not (pre < warning and cumulative[hard_index] >= warning):
+                    crossings.append((hard_index, "hard_stop"))
+        crossings.sort()
+        return crossings
+    
+    def _calculate_costs(self, op_types, complexities=None, sizes=None):
+        """Calculate costs for columnar inputs, once per distinct row"""
+        count = len(op_types)
+        complexities = repeat(None, count) if complexities is None else complexities
+        sizes = repeat(None, count) if sizes is None else sizes
+        return self.cost_model.costs(op_types, complexities, sizes)
+    
+    def _calculate_cost(self, op_type, complexity=None, size=None):
+        """Calculate operation cost from the compiled cost model"""
+        return self.cost_model.cost(op_type, complexity, size)
     
     def estimate(self, task, complexity="medium", size="medium"):
         """Estimate operation cost with decision support"""
+        cost, rounded = self._cached_cost(task, complexity, size)
+        return self._assess(cost, task, rounded)
+    
+    @property
+    def cost_model(self):
+        """Cost model used for every cost calculation"""
+        return self._cost_model
+    
+    @cost_model.setter
+    def cost_model(self, cost_model):
+        """Replace the cost model; costs cached from the old one are dropped"""
+        self._cost_model = cost_model
+        self.clear_estimate_cache()
+    
+    def _cached_cost(self, task, complexity, size):
+        """(cost, rounded cost) through a bounded LRU keyed by (task, complexity, size)"""
+        key = (task, complexity, size)
+        cache = self._estimate_cache
+        try:
+            entry = cache.get(key)
+        except TypeError:
+            # Unhashable inputs bypass the cache
+            cost = self._calculate_cost(task, complexity, size)
+            return cost, round(cost, 1)
+        if entry is not None:
+            self._estimate_hits += 1
+            try:
+                cache.move_to_end(key)
+            except KeyError:
+                # Evicted by another thread in between; still a valid value
+                pass
+            return entry
+        
+        self._estimate_misses += 1
         cost = self._calculate_cost(task, complexity, size)
+        entry = cache[key] = (cost, round(cost, 1))
+        if len(cache) > self._estimate_cache_size:
+            cache.popitem(last=False)
+        return entry
+    
+    def estimate_cache_info(self):
+        """
+        Effectiveness of the estimate() cost cache
+        
+        Returns:
+            dict: hits, misses, size, maxsize, hit_rate
+        """
+        lookups = self._estimate_hits + self._estimate_misses
+        return {
+            "hits": self._estimate_hits,
+            "misses": self._estimate_misses,
+            "size": len(self._estimate_cache),
+            "maxsize": self._estimate_cache_size,
+            "hit_rate": round(self._estimate_hits / lookups, 3) if lookups else 0.0
+        }
+    
+    def clear_estimate_cache(self):
+        """Drop cached costs (e.g. after changing cost_model in place) and reset counters"""
+        self._estimate_cache.clear()
+        self._estimate_hits = 0
+        self._estimate_misses = 0
+        self._bands_cache = {}
+    
+    def _assess(self, cost, task=None, rounded_cost=None):
+        """Build the decision-support assessment for a given cost"""
         post_usage = self.usage + cost
         remaining = 100 - post_usage
         
         # Determine status and recommendation
-        if post_usage >= self.thresholds["hard_stop"]:
-            status = "CRITICAL"
-            recommendation = "New session first"
-            proceed = False
-        elif post_usage >= self.thresholds["warning"]:
-            status = "WARNING"
-            recommendation = "Complete then hop"
-            proceed = True
-        elif post_usage >= self.thresholds["warning"] * 0.8:
-            status = "CAUTION"
-            recommendation = "Monitor capacity"
-            proceed = True
-        else:
-            status = "NORMAL"
-            recommendation = "Proceed"
-            proceed = True
+        status = usage_status(post_usage, self.thresholds["warning"], self.thresholds["hard_stop"])
         
         # Return compact assessment
-        return {
-            "cost": round(cost, 1),
+        assessment = {
+            "cost": round(cost, 1) if rounded_cost is None else rounded_cost,
             "current": round(self.usage, 1),
             "post": round(post_usage, 1),
             "remaining": round(remaining, 1),
             "status": status,
-            "recommendation": recommendation,
-            "proceed": proceed
+            "recommendation": RECOMMENDATIONS[status],
+            "proceed": status != "CRITICAL"
         }
+        
+        # Observed cost percentiles for this op type, when any were recorded
+        bands = self.cost_bands(task) if task is not None else None
+        if bands:
+            assessment["bands"] = bands
+        return assessment
+    
+    def cost_bands(self, op_type):
+        """
+        Percentile bands of observed costs for an op type
+        
+        Combines this session's sketch with history loaded by load_history().
+        
+        Returns:
+            dict: {"p50", "p90", "p95"} or None without observations
+        """
+        sketch = self.sketches.get(op_type)
+        history = self.history_sketches.get(op_type) if self.history_sketches else None
+        
+        # Sketches only change by growing, so identity plus count pins their
+        # state; the entry holds the sketches themselves so that objects
+        # replaced by load_history() can never match a recycled id
+        count = sketch.count if sketch is not None else 0
+        history_count = history.count if history is not None else 0
+        cached = self._bands_cache.get(op_type)
+        if (cached is not None and cached[0] is sketch and cached[1] == count
+                and cached[2] is history and cached[3] == history_count):
+            return dict(cached[4]) if cached[4] else None
+        
+        entry = (sketch, count, history, history_count)
+        if history is not None:
+            sketch = history.copy().merge(sketch) if sketch is not None else history
+        bands = sketch.bands() if sketch is not None and sketch.count else None
+        self._bands_cache[op_type] = entry + (bands,)
+        return dict(bands) if bands else None
+    
+    def load_history(self):
+        """Load merged per-op cost sketches from persisted sessions, excluding this one's saved part"""
+        from quantile_sketch import CostSketch
+        summary = self.metrics_log.summary()
+        history = {}
+        for op_type, data in summary.get("sketches", {}).items():
+            sketch = CostSketch.from_dict(data)
+            if op_type in self._saved_sketches:
+                # This session's saved costs are also in its live sketch: keep
+                # them out of history so cost_bands() counts them once
+                sketch = sketch.difference(CostSketch.from_dict(self._saved_sketches[op_type]))
+            history[op_type] = sketch
+        self.history_sketches = history
+        return self.history_sketches
+    
+    def estimate_many(self, tasks, complexities=None, sizes=None):
+        """
+        Estimate a batch of independent tasks against current usage
+        
+        Args:
+            tasks (list): Task type per row
+            complexities (list): Complexity per row (None for "medium")
+            sizes (list): Size per row (None for "medium")
+            
+        Returns:
+            list: estimate() result for each row
+        """
+        count = len(tasks)
+        complexities = repeat("medium", count) if complexities is None else complexities
+        sizes = repeat("medium", count) if sizes is None else sizes
+        costs = self._calculate_costs(tasks, complexities, sizes)
+        return [self._assess(cost, task) for cost, task in zip(costs, tasks)]
+    
+    def plan(self, tasks, target="warning", session_base=0.0, resolution=0.5):
+        """
+        Pack a task backlog into this and following sessions
+        
+        Args:
+            tasks (list): Dicts with "type" and optional "id", "complexity",
+                "size", "priority" and "depends_on"
+            target (str): Threshold each session is filled up to
+            session_base (float): Usage a fresh session starts at
+            resolution (float): Cost granularity of the packing DP
+            
+        Returns:
+            dict: CapacityPlanner.plan() result starting from current usage
+        """
+        from capacity_planner import CapacityPlanner
+        planner = CapacityPlanner(self.cost_model, self.thresholds, target, session_base, resolution)
+        return planner.plan(tasks, usage=self.usage)
     
     def check(self):
         """Explicit status check with minimal output"""
-        status = "NORMAL"
-        if self.usage >= self.thresholds["hard_stop"]: 
-            status = "CRITICAL"
-        elif self.usage >= self.thresholds["warning"]: 
-            status = "WARNING"
-        elif self.usage >= self.thresholds["warning"] * 0.8: 
-            status = "CAUTION"
+        status = usage_status(self.usage, self.thresholds["warning"], self.thresholds["hard_stop"])
         
         # Return compact status report
         return {
@@ -173,80 +474,170 @@ class MinimalTracker:
         }
     
     def save_metrics(self):
-        """Save consolidated metrics to JSON file"""
+        """Append session record to the segmented metrics log"""
         try:
-            # Check for existing metrics file
-            if os.path.exists(self.metrics_file):
-                with open(self.metrics_file, 'r') as f:
-                    metrics = json.load(f)
-            else:
-                metrics = {"sessions": [], "thresholds": [], "operations": {}}
-            
-            # Current session data
-            session = {
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "session_id": self.session_id,
-                "start": self.start_time.isoformat(),
-                "end": datetime.now().isoformat(),
-                "duration_mins": round((datetime.now() - self.start_time).total_seconds() / 60, 1),
-                "operations": self.operations,
-                "usage": round(self.usage, 1),
-                "thresholds": self.thresholds,
-                "warning_observed": self.warning_observed,
-                "warning_time": self.warning_time.isoformat() if self.warning_time else None,
-                "hard_stop_observed": self.hard_stop_observed,
-                "hard_stop_time": self.hard_stop_time.isoformat() if self.hard_stop_time else None
-            }
-            
-            # Add to sessions and keep only most recent 10
-            metrics["sessions"].append(session)
-            if len(metrics["sessions"]) > 10:
-                metrics["sessions"] = metrics["sessions"][-10:]
-            
-            # Update operation metrics and threshold history
-            for op_type, data in self.operations.items():
-                if op_type not in metrics["operations"]:
-                    metrics["operations"][op_type] = {"count": 0, "total_cost": 0}
-                metrics["operations"][op_type]["count"] += data["count"]
-                metrics["operations"][op_type]["total_cost"] += data["total_cost"]
-            
-            # Add thresholds to history
-            metrics["thresholds"].append(self.thresholds)
-            if len(metrics["thresholds"]) > 20:
-                metrics["thresholds"] = metrics["thresholds"][-20:]
-            
-            # Calculate averages
-            metrics["avg_warning"] = sum(t["warning"] for t in metrics["thresholds"]) / len(metrics["thresholds"])
-            metrics["avg_hard_stop"] = sum(t["hard_stop"] for t in metrics["thresholds"]) / len(metrics["thresholds"])
-            
-            # Write to file
-            with open(self.metrics_file, 'w') as f:
-                json.dump(metrics, f, indent=2)
-            
-            return {"status": "success", "file": self.metrics_file}
+            return self._write_record(self._session_record())
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
+    def _write_record(self, record):
+        """Append a session snapshot and remember what the summary now holds"""
+        with self._write_lock:
+            op_delta = self._operations_delta(record["operations"], record["sketches"])
+            segment = self.metrics_log.append(record, op_delta)
+            self._saved_operations = {op: dict(data) for op, data in record["operations"].items()}
+            self._saved_sketches = record["sketches"]
+        return {"status": "success", "file": segment}
+    
+    def load_metrics(self):
+        """Load consolidated metrics rollups from the log summary"""
+        return self.metrics_log.summary()
+    
+    def _session_record(self):
+        """Snapshot current session state as a compact log record"""
+        now = datetime.now()
+        return {
+            "date": now.strftime("%Y-%m-%d"),
+            "session_id": self.session_id,
+            "start": self.start_time.isoformat(),
+            "end": now.isoformat(),
+            "duration_mins": round((now - self.start_time).total_seconds() / 60, 1),
+            # list() copies in one step, safe against a concurrent register()
+            "operations": {op: dict(data) for op, data in list(self.operations.items())},
+            "sketches": {op: sketch.to_dict() for op, sketch in list(self.sketches.items())},
+            "usage": round(self.usage, 1),
+            "thresholds": dict(self.thresholds),
+            "warning_observed": self.warning_observed,
+            "warning_time": self.warning_time.isoformat() if self.warning_time else None,
+            "hard_stop_observed": self.hard_stop_observed,
+            "hard_stop_time": self.hard_stop_time.isoformat() if self.hard_stop_time else None
+        }
+    
+    def _operations_delta(self, operations, sketches=None):
+        """Per-op counts, costs and cost sketches recorded since the last successful save"""
+        from quantile_sketch import CostSketch
+        delta = {}
+        for op_type, data in operations.items():
+            saved = self._saved_operations.get(op_type, {"count": 0, "total_cost": 0})
+            if data["count"] != saved["count"]:
+                delta[op_type] = {
+                    "count": data["count"] - saved["count"],
+                    "total_cost": data["total_cost"] - saved["total_cost"]
+                }
+                if sketches and op_type in sketches:
+                    sketch = CostSketch.from_dict(sketches[op_type])
+                    if op_type in self._saved_sketches:
+                        sketch = sketch.difference(CostSketch.from_dict(self._saved_sketches[op_type]))
+                    delta[op_type]["sketch"] = sketch.to_dict()
+        return delta
+    
     def init_session(self, kb=0):
         """Initialize session with context loading"""
         if kb > 0:
             return self.register("context", size=kb)
         return None
     
-    def prepare_hop(self):
-        """Prepare for session hop with recommendations"""
-        metrics = {
-            "usage": round(self.usage, 1),
-            "operations": self.operations,
-            "duration_mins": round((datetime.now() - self.start_time).total_seconds() / 60, 1),
-            "recommendation": self._get_hop_recommendation()
-        }
+    def prepare_hop(self, snapshot_path=None):
+        """
+        Prepare for session hop with recommendations
+        
+        Args:
+            snapshot_path (str): Also write a binary snapshot here so the
+                next session can resume with MinimalTracker.restore()
+        """
+        metrics = self._hop_metrics()
         
         # Save metrics
         self.save_metrics()
         
+        if snapshot_path:
+            self.snapshot(snapshot_path)
+            metrics["snapshot"] = snapshot_path
+        
         return metrics
     
+    def snapshot(self, path):
+        """
+        Write tracker state to a compact binary snapshot
+        
+        Args:
+            path (str): Snapshot file (replaced atomically)
+            
+        Returns:
+            dict: Status with file path and size in bytes
+        """
+        import snapshot
+        from quantile_sketch import CostSketch
+        # The lock keeps the saved_* baselines consistent with each other
+        # against a concurrent save; register() does not take it, so live
+        # totals and sketches are copied rather than encoded in place
+        with self._write_lock:
+            state = {
+                "session_id": self.session_id,
+                "usage": self.usage,
+                "thresholds": dict(self.thresholds),
+                "start": self.start_time.timestamp(),
+                "warning_time": self.warning_time.timestamp() if self.warning_time else None,
+                "hard_stop_time": self.hard_stop_time.timestamp() if self.hard_stop_time else None,
+                "warning_observed": self.warning_observed,
+                "hard_stop_observed": self.hard_stop_observed,
+                # list() copies in one step, safe against a concurrent register()
+                "operations": {op: dict(data) for op, data in list(self.operations.items())},
+                "saved_operations": self._saved_operations,
+                "sketches": {op: sketch.copy() for op, sketch in list(self.sketches.items())},
+                "saved_sketches": {op: CostSketch.from_dict(data) for op, data in self._saved_sketches.items()}
+            }
+        size = snapshot.write(path, state)
+        return {"status": "success", "file": path, "bytes": size}
+    
+    @classmethod
+    def restore(cls, path, silent=True, cost_model=None, metrics_store=None):
+        """
+        Resume a tracker from a snapshot written by snapshot()
+        
+        The session ID is kept, so later saves update the same session
+        record rather than double-counting operations already saved.
+        
+        Args:
+            path (str): Snapshot file
+            silent (bool): Silent mode for the restored tracker
+            cost_model (CostModel): Cost model (defaults to cost_model.json)
+            metrics_store: Persistence backend (defaults to the segmented log)
+            
+        Returns:
+            MinimalTracker: Tracker with the snapshotted state
+            
+        Raises:
+            ValueError: If the file is not a valid snapshot
+        """
+        import snapshot
+        state = snapshot.read(path)
+        tracker = cls(silent=silent, cost_model=cost_model, metrics_store=metrics_store)
+        tracker.session_id = state["session_id"]
+        tracker.usage = state["usage"]
+        tracker.thresholds = state["thresholds"]
+        tracker.start_time = datetime.fromtimestamp(state["start"])
+        tracker.warning_observed = state["warning_observed"]
+        tracker.hard_stop_observed = state["hard_stop_observed"]
+        if state["warning_time"] is not None:
+            tracker.warning_time = datetime.fromtimestamp(state["warning_time"])
+        if state["hard_stop_time"] is not None:
+            tracker.hard_stop_time = datetime.fromtimestamp(state["hard_stop_time"])
+        tracker.operations = state["operations"]
+        tracker.sketches = state["sketches"]
+        tracker._saved_operations = state["saved_operations"]
+        tracker._saved_sketches = {op: sketch.to_dict() for op, sketch in state["saved_sketches"].items()}
+        return tracker
+    
+    def _hop_metrics(self):
+        """Summary returned by prepare_hop"""
+        return {
+            "usage": round(self.usage, 1),
+            "operations": self.operations,
+            "duration_mins": round((datetime.now() - self.start_time).total_seconds() / 60, 1),
+            "recommendation": self._get_hop_recommendation()
+        }
+    
     def _get_hop_recommendation(self):
         """Generate hop recommendation based on usage"""
         if self.usage >= 85: 
@@ -260,9 +651,11 @@ class MinimalTracker:
         """Register threshold observation with adaptation"""
         if threshold_type == "warning":
             self.thresholds["warning"] = value or self.usage
+            self._mark_changed()
             return f"Warning updated: {self.thresholds['warning']}%"
         elif threshold_type == "hard_stop":
             self.thresholds["hard_stop"] = value or self.usage
+            self._mark_changed()
             return f"Hard stop updated: {self.thresholds['hard_stop']}%"
         return f"Unknown threshold: {threshold_type}"
     
@@ -276,6 +669,8 @@ class MinimalTracker:
             self.thresholds["hard_stop"] = (hard_stop * 0.7) + (self.thresholds["hard_stop"] * 0.3)
             self.thresholds["hard_stop"] = round(self.thresholds["hard_stop"], 1)
         
+        if warning or hard_stop:
+            self._mark_changed()
         return self.thresholds
     
     def background_mode(self, enabled=True):
@@ -286,6 +681,8 @@ class MinimalTracker:
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # Create minimal tracker
     tracker = MinimalTracker(silent=False)
     
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: mobile_client.py - Thin client for the MobileSession daemon
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: mobile_daemon.py (protocol), mobile_integration.py (fallback only)
+IMPORTED_BY: None
+
+TABLE_OF_CONTENTS:
+1. MobileClient Class - process_command()/process_batch() forwarded over the daemon's socket
+2. State Polling - Compact gauge state kept current from deltas
+3. Fallback - In-process MobileSession when no daemon is listening
+4. Command Line - python mobile_client.py "/g" [--socket PATH] [--no-fallback] [--state]
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Only socket/json are imported up front; the package (AutoInit, gauges)
+is loaded only if the client has to fall back to a local session.
+"""
+
+import os
+import sys
+import json
+import socket
+import tempfile
+
+SOCKET_ENV = "GAS_DAEMON_SOCKET"
+DEFAULT_TIMEOUT = 10.0
+
+
+def default_socket_path():
+    """Same resolution as mobile_daemon.default_socket_path() without importing it"""
+    return os.environ.get(SOCKET_ENV) or os.path.join(
+        tempfile.gettempdir(), f"teambadass-gas-{os.getuid() if hasattr(os, 'getuid') else 0}.sock")
+
+
+class MobileClient:
+    """MobileSession-compatible process_command() backed by the daemon"""
+
+    def __init__(self, socket_path=None, session="default", mobile=None, fallback=True, timeout=DEFAULT_TIMEOUT):
+        """
+        Configure the client (connects on first use)
+
+        Args:
+            socket_path (str): Daemon socket (see default_socket_path())
+            session (str): Daemon-side session name
+            mobile (bool): Mobile/desktop output (daemon's detection if None)
+            fallback (bool): Run commands in-process when the daemon is unreachable
+            timeout (float): Socket timeout in seconds
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.session = session
+        self.mobile = mobile
+        self.fallback = fallback
+        self.timeout = timeout
+        self.local_session = None
+        self.gauge_state = {}
+        self._sock = None
+        self._reader = None
+
+    @property
+    def connected(self):
+        return self._sock is not None
+
+    def request(self, payload):
+        """
+        Send one request object and wait for the reply
+
+        Retried once only if connecting or sending failed before any of
+        the request went out; once written it is never resent.
+
+        Raises:
+            OSError: Daemon unreachable or connection dropped
+        """
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n"
+        for attempt in (0, 1):
+            try:
+                if self._sock is not None and self._peer_closed():
+                    self.close()
+                if self._sock is None:
+                    self._connect()
+                # send() rather than sendall() so a partial write is visible
+                sent = self._sock.send(data)
+            except OSError:
+                self.close()
+                # Nothing reached the daemon (a restart drops kept-alive
+                # connections): safe to retry once on a fresh connection
+                if attempt:
+                    raise
+                continue
+            try:
+                if sent < len(data):
+                    self._sock.sendall(data[sent:])
+                line = self._reader.readline()
+                if not line:
+                    raise ConnectionError("Daemon closed the connection")
+                return json.loads(line)
+            except OSError:
+                # The request may have run: never resend it
+                self.close()
+                raise
+
+    def process_command(self, text):
+        """
+        Forward a command, falling back to a local session if needed
+
+        Returns:
+            tuple: (was_command, result) as MobileSession.process_command()
+        """
+        if self.local_session is None:
+            try:
+                reply = self.request({"command": text, "session": self.session, "mobile": self.mobile})
+            except OSError:
+                if not self.fallback:
+                    raise
+            else:
+                if reply["status"] != "success":
+                    return True, f"⚠️ Daemon error: {reply['message']}"
+                return reply["was_command"], reply["result"]
+            self._start_local_session()
+        return self.local_session.process_command(text)
+
+    def process_batch(self, script):
+        """
+        Run a batch in one round trip, falling back to a local session if needed
+
+        Returns:
+            dict: As MobileSession.process_batch()
+        """
+        if self.local_session is None:
+            try:
+                return self.request({"op": "batch", "script": script, "session": self.session,
+                                     "mobile": self.mobile})
+            except OSError:
+                if not self.fallback:
+                    raise
+            self._start_local_session()
+        return self.local_session.process_batch(script)
+
+    def poll_state(self):
+        """
+        Refresh gauge_state with a delta against the last version seen
+
+        Returns:
+            dict: Full compact state (i, v, l, s, w, h; see
+                MobileSession.compact_state()), or the daemon's error reply
+        """
+        since = self.gauge_state.get("v")
+        epoch = self.gauge_state.get("i")
+        if self.local_session is None:
+            try:
+                reply = self.request({"op": "state", "since": since, "epoch": epoch, "session": self.session,
+                                      "mobile": self.mobile})
+            except OSError:
+                if not self.fallback:
+                    raise
+            else:
+                if "v" not in reply:
+                    return reply
+                self.gauge_state.update(reply)
+                return dict(self.gauge_state)
+            self._start_local_session()
+        self.gauge_state.update(self.local_session.compact_state(since, epoch))
+        return dict(self.gauge_state)
+
+    def ping(self):
+        """Daemon status, or None if no daemon is listening"""
+        try:
+            return self.request({"op": "ping"})
+        except OSError:
+            return None
+
+    def close(self):
+        """Drop the connection (the daemon keeps the session)"""
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+
+    def _peer_closed(self):
+        """True if the daemon hung up the kept-alive connection (e.g. it restarted)"""
+        self._sock.setblocking(False)
+        try:
+            return self._sock.recv(1, socket.MSG_PEEK) == b""
+        except BlockingIOError:
+            return False
+        except OSError:
+            return True
+        finally:
+            self._sock.settimeout(self.timeout)
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+    def _start_local_session(self):
+        """In-process session, initialized the way the daemon would"""
+        from mobile_integration import MobileSession
+        self.local_session = MobileSession(mobile=self.mobile)
+        self.local_session.initialize()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# Forward a command (or a batch of them) and print the reply
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    path = sys.argv[sys.argv.index("--socket") + 1] if "--socket" in sys.argv else None
+    if path in args:
+        args.remove(path)
+    mobile = True if "--mobile" in sys.argv else None
+    with MobileClient(path, mobile=mobile, fallback="--no-fallback" not in sys.argv) as client:
+        try:
+            if "--state" in sys.argv:
+                print(json.dumps(client.poll_state(), ensure_ascii=False))
+                sys.exit(0)
+            # "/g /s /p code medium large" runs as one batch
+            reply = client.process_batch(" ".join(args) or "/g")
+        except OSError as e:
+            print(f"❌ TeamBadass daemon not reachable: {e}")
+            sys.exit(1)
+    if reply["status"] != "success":
+        print(f"⚠️ Daemon error: {reply['message']}")
+    else:
+        print(reply["display_message"] or "Not a command")
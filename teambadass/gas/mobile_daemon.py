@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: mobile_daemon.py - Long-running host for initialized MobileSessions
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: mobile_integration.py, unix_socket.py, socketserver (standard library)
+IMPORTED_BY: mobile_client.py
+
+TABLE_OF_CONTENTS:
+1. MobileDaemon Class - Sessions kept in memory, served over a Unix socket
+2. Protocol - One JSON object per line each way; connections are reusable
+3. Sessions - Created and initialized on first use, keyed by name and mode
+4. Command Line - python mobile_daemon.py [--socket PATH]
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Requests:
+    {"command": "/g", "session": "default", "mobile": true}
+    {"op": "batch", "script": "/g /s" | ["/g", "/s"], "session": ...}
+    {"op": "state", "since": 4, "epoch": "9f3a1c", "session": ...}
+    {"op": "ping"} | {"op": "sessions"} | {"op": "close", "session": ...}
+Replies:
+    {"status": "success", "was_command": true, "result": "🔋 Gas: ..."}
+    batch: MobileSession.process_batch() result
+    state: MobileSession.compact_state() as is, e.g. {"v":4} when unchanged
+    {"status": "error", "message": "..."}
+
+Sessions resolve repository paths against the daemon's working
+directory, so start it from the checkout it should serve.
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+import threading
+import socketserver
+
+from mobile_integration import MobileSession
+from unix_socket import claim_socket_path, release_socket_path, socket_identity
+
+logger = logging.getLogger("TeamBadass")
+
+SOCKET_ENV = "GAS_DAEMON_SOCKET"
+
+
+def default_socket_path():
+    """GAS_DAEMON_SOCKET, else a per-user socket in the temp directory"""
+    return os.environ.get(SOCKET_ENV) or os.path.join(
+        tempfile.gettempdir(), f"teambadass-gas-{os.getuid() if hasattr(os, 'getuid') else 0}.sock")
+
+
+class MobileDaemon:
+    """Answers MobileSession commands from sessions that stay initialized"""
+
+    def __init__(self, socket_path=None, session_factory=MobileSession):
+        """
+        Configure the daemon (nothing is bound until start())
+
+        Args:
+            socket_path (str): Unix socket to listen on (see default_socket_path())
+            session_factory (callable): Builds a session from mobile=<bool>
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.session_factory = session_factory
+        self.request_count = 0
+
+        # (name, mobile) -> [session, lock]; commands on one session run serially
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._socket_identity = None
+
+    def session(self, name="default", mobile=None):
+        """
+        Hosted session, created and initialized on first use
+
+        Returns:
+            tuple: (MobileSession, its lock)
+        """
+        key = (name, mobile)
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = self._sessions[key] = [None, threading.Lock()]
+        session, lock = entry
+        if session is None:
+            with lock:
+                if entry[0] is None:
+                    session = self.session_factory(mobile=mobile)
+                    session.initialize()
+                    entry[0] = session
+                session = entry[0]
+        return session, lock
+
+    def handle(self, request):
+        """
+        Answer one decoded request
+
+        Args:
+            request (dict): See module docstring
+
+        Returns:
+            dict: Reply object
+        """
+        with self._lock:
+            self.request_count += 1
+        op = request.get("op", "command")
+        if op == "command":
+            text = request.get("command")
+            if not isinstance(text, str):
+                return {"status": "error", "message": "Missing command"}
+            session, lock = self.session(request.get("session", "default"), request.get("mobile"))
+            with lock:
+                was_command, result = session.process_command(text)
+            return {"status": "success", "was_command": was_command, "result": result}
+        if op == "batch":
+            script = request.get("script")
+            if not isinstance(script, (str, list)):
+                return {"status": "error", "message": "Missing script"}
+            session, lock = self.session(request.get("session", "default"), request.get("mobile"))
+            with lock:
+                return session.process_batch(script)
+        if op == "state":
+            session, lock = self.session(request.get("session", "default"), request.get("mobile"))
+            with lock:
+                return session.compact_state(request.get("since"), request.get("epoch"))
+        if op == "ping":
+            return {"status": "success", "pid": os.getpid(), "sessions": len(self._sessions)}
+        if op == "sessions":
+            with self._lock:
+                keys = list(self._sessions)
+            return {"status": "success", "sessions": [{"session": name, "mobile": mobile} for name, mobile in keys]}
+        if op == "close":
+            name = request.get("session", "default")
+            with self._lock:
+                closed = [key for key in self._sessions if key[0] == name]
+                for key in closed:
+                    del self._sessions[key]
+            return {"status": "success", "closed": len(closed)}
+        return {"status": "error", "message": f"Unknown op: {op}"}
+
+    def start(self):
+        """Bind the socket and serve from a daemon thread"""
+        if self._server is not None:
+            return self
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mobile-daemon", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Bind the socket and serve on the calling thread until stop() or Ctrl-C"""
+        self._bind()
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._close()
+
+    def stop(self):
+        """Shut the server down and remove the socket"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close()
+
+    def _bind(self):
+        # Raises if another daemon is listening or the path is not a socket
+        claim_socket_path(self.socket_path, "TeamBadass daemon")
+        # Private to the user: sessions answer anything sent to the socket
+        previous = os.umask(0o177)
+        try:
+            server = _DaemonServer(self.socket_path, _DaemonHandler)
+        finally:
+            os.umask(previous)
+        server.mobile_daemon = self
+        self._server = server
+        self._socket_identity = socket_identity(self.socket_path)
+
+    def _close(self):
+        if self._server is None:
+            return
+        self._server.server_close()
+        self._server = None
+        # Only remove the socket this daemon bound (not a successor's)
+        release_socket_path(self.socket_path, self._socket_identity)
+        self._socket_identity = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """Reads request lines until the client hangs up"""
+
+    def handle(self):
+        daemon = self.server.mobile_daemon
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                reply = {"status": "error", "message": f"Bad request: {e}"}
+            else:
+                if isinstance(request, dict):
+                    try:
+                        reply = daemon.handle(request)
+                    except Exception as e:
+                        logger.error(f"Daemon request failed: {e}")
+                        reply = {"status": "error", "message": str(e)}
+                else:
+                    reply = {"status": "error", "message": "Request must be a JSON object"}
+            try:
+                self.wfile.write(json.dumps(reply, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            except OSError:
+                # Client gave up waiting (timeout) and hung up
+                return
+
+
+class _DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+# Run in the foreground
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    path = sys.argv[sys.argv.index("--socket") + 1] if "--socket" in sys.argv else None
+    daemon = MobileDaemon(path)
+    print(f"🛰️ TeamBadass daemon listening on {daemon.socket_path}")
+    try:
+        daemon.serve_forever()
+    except OSError as e:
+        print(f"❌ {e.strerror or e}")
+        sys.exit(1)
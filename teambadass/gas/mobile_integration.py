@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 """
 FILE_OVERVIEW: mobile_integration.py - TeamBadass Mobile Session Handler
-VERSION: 1.0.0
-LAST_UPDATED: 2025-05-01
-DEPENDENCIES: auto_init.py
+VERSION: 1.4.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: auto_init.py, startup_profiler.py
 IMPORTED_BY: session_start.py
 
 TABLE_OF_CONTENTS:
 1. Mobile Detection - Methods to detect mobile environment
 2. Session Optimization - Streamlined session handling for mobile
 3. Command Processing - Shorthand command processing for mobile
+4. Status Cache - Rendered /g and /s output reused until gauge state changes
+5. Batches - Several commands parsed once and run against one gauge state
+6. Compact State - Minimal-JSON gauge state, sent as a delta against a seen version
 
 SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
 """
@@ -19,34 +22,76 @@ import sys
 import re
 import json
 import logging
-from datetime import datetime
+import importlib
+from collections import OrderedDict
 
-# Import auto initialization system
-from auto_init import AutoInit
+from startup_profiler import PROFILER
+
+# Import auto initialization system (the package import a cold start pays for)
+with PROFILER.phase("import"):
+    from auto_init import AutoInit
 
-# Configure minimal logging for mobile
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s'  # Simplified format for mobile
-)
 logger = logging.getLogger("TeamBadass")
 
+GAUGE_REPORTING_MODULE = "teambadass._memory.gas_gauge.gauge_reporting"
+
+COMMAND_NAMES = ("/g", "/i", "/s", "/p", "/h", "/c")
+
+# Compact state versions kept to diff against
+COMPACT_HISTORY = 32
+
+# Command token and its arguments (leading whitespace dropped, as str.split)
+_COMMAND = re.compile(r"(/\S*)\s*(.*)", re.S)
+# Known command token at the start of a batch segment
+_BATCH_COMMAND = re.compile(r"(" + "|".join(map(re.escape, COMMAND_NAMES)) + r")(?:\s+|$)", re.I)
+_PRE_TASK_ARGS = re.compile(r"(\w+)\s+(\w+)\s+(\w+)")
+
+# gauge_reporting module, False once its import failed, None before the first try
+_gauge_reporting = None
+
+
+def _load_gauge_reporting():
+    """Import gauge_reporting once per process (failed imports are not retried)"""
+    global _gauge_reporting
+    if _gauge_reporting is None:
+        try:
+            _gauge_reporting = importlib.import_module(GAUGE_REPORTING_MODULE)
+        except ImportError:
+            _gauge_reporting = False
+    return _gauge_reporting
+
 class MobileSession:
     """TeamBadass mobile session handler with optimizations"""
     
-    def __init__(self):
-        """Initialize mobile session handler"""
-        self.is_mobile = self._detect_mobile()
+    def __init__(self, mobile=None):
+        """
+        Initialize mobile session handler
+        
+        Args:
+            mobile (bool): Force mobile/desktop output (detected if None)
+        """
+        self.is_mobile = self._detect_mobile() if mobile is None else mobile
         self.auto_init = AutoInit(mobile_optimized=self.is_mobile)
         self.initialized = False
         self.gas_gauge = None
-        self.commands = {
-            "/g": self._cmd_check_gas,
-            "/i": self._cmd_initialize,
-            "/s": self._cmd_status,
-            "/p": self._cmd_pre_task,
-            "/h": self._cmd_help
-        }
+        self.state_version = 0
+        self._gauge_state = None
+        # Version every command in a running batch renders against
+        self._pinned_version = None
+        # Compact state per version; the epoch tells clients versions of an
+        # earlier session (e.g. before a daemon restart) are not comparable
+        self.state_epoch = os.urandom(3).hex()
+        self._compact_history = OrderedDict()
+        # (command, is_mobile) -> (state_version, rendered text)
+        self._render_cache = {}
+        self.commands = dict(zip(COMMAND_NAMES, (
+            self._cmd_check_gas,
+            self._cmd_initialize,
+            self._cmd_status,
+            self._cmd_pre_task,
+            self._cmd_help,
+            self._cmd_compact
+        )))
     
     def _detect_mobile(self):
         """
@@ -110,12 +155,15 @@ class MobileSession:
         else:
             status_message = self.auto_init.get_initialization_report()
         
-        return {
+        result = {
             "status": "success" if self.initialized else "partial",
             "message": status_message,
             "gas_level": gas_result.get("gas_level") if gas_result["status"] == "success" else None,
             "initialized": self.initialized
         }
+        if PROFILER.enabled:
+            result["startup"] = PROFILER.report()
+        return result
     
     def process_command(self, text):
         """
@@ -133,26 +181,212 @@ class MobileSession:
             return False, None
         
         # Extract command and arguments
-        parts = text.split(maxsplit=1)
-        command = parts[0].lower()
-        args = parts[1] if len(parts) > 1 else ""
+        command, args = _COMMAND.match(text).groups()
         
-        # Check if command exists
-        if command in self.commands:
+        # Check if command exists (lowercasing only unknown spellings)
+        handler = self.commands.get(command) or self.commands.get(command.lower())
+        if handler is not None:
             # Execute command
-            result = self.commands[command](args)
+            result = handler(args)
             return True, result
         
         return False, None
     
+    def parse_batch(self, script):
+        """
+        Split a batch into commands
+        
+        Commands are only recognized at the start of a line or after ";".
+        Commands with no arguments may be chained ("/g /s /p code medium
+        large"); after a command's first argument the rest of the segment
+        is its arguments, so "/p code medium large /s" is one command and
+        "see /s for status" is text.
+        
+        Args:
+            script (str|list): Multi-line text, or a list of command strings
+            
+        Returns:
+            list: (command, args) pairs; command is None for text that is not a command
+        """
+        lines = script.splitlines() if isinstance(script, str) else script
+        entries = []
+        for line in lines:
+            for segment in line.split(";"):
+                rest = segment.strip()
+                if not rest:
+                    continue
+                match = _BATCH_COMMAND.match(rest)
+                if match is None:
+                    entries.append((None, rest))
+                    continue
+                while match is not None:
+                    command, rest = match.group(1).lower(), rest[match.end():]
+                    # Another command right away: this one has no arguments
+                    match = _BATCH_COMMAND.match(rest)
+                    entries.append((command, "" if match else rest.strip()))
+        return entries
+    
+    def process_batch(self, script):
+        """
+        Run several commands against one consistent gauge state
+        
+        /s in the batch renders once (/g still reads the gauge each time,
+        reusing its formatting); the state is only re-read after a /i in
+        the batch replaces the gauge.
+        
+        Args:
+            script (str|list): See parse_batch()
+            
+        Returns:
+            dict: status, state_version, results (command, was_command, result
+                per entry) and display_message (results joined)
+        """
+        entries = self.parse_batch(script)
+        results = []
+        self._pinned_version = self.refresh_state_version()
+        try:
+            for command, args in entries:
+                handler = self.commands.get(command)
+                if handler is None:
+                    results.append({"command": args, "was_command": False, "result": None})
+                    continue
+                results.append({"command": f"{command} {args}".rstrip(), "was_command": True, "result": handler(args)})
+                if command == "/i":
+                    self._pinned_version = self.refresh_state_version()
+            version = self._pinned_version
+        finally:
+            self._pinned_version = None
+        
+        return {
+            "status": "success",
+            "state_version": version,
+            "results": results,
+            "display_message": "\n\n".join(entry["result"] for entry in results if entry["was_command"])
+        }
+    
+    def refresh_state_version(self):
+        """
+        Bump state_version if the gauge state behind /g and /s changed
+        
+        The state is the gauge object, its `version` attribute if it has one,
+        its level and its thresholds. Gauges exposing none of these are
+        treated as changed on every call, so their output is never cached.
+        
+        Returns:
+            int: Current state version
+        """
+        gauge = self.gas_gauge
+        level = getattr(gauge, "current_level", None)
+        version = getattr(gauge, "version", None)
+        if gauge is not None and level is None and version is None:
+            self._gauge_state = None
+            self.state_version += 1
+            return self.state_version
+        
+        thresholds = getattr(gauge, "resource_map", {}).get("thresholds", {})
+        state = (id(gauge), self.initialized, version, level,
+                 thresholds.get("long_chats_warning"), thresholds.get("hard_stop"))
+        if state != self._gauge_state:
+            self._gauge_state = state
+            self.state_version += 1
+        return self.state_version
+    
+    def invalidate_status_cache(self):
+        """Drop rendered /g and /s output (for gauges that change state silently)"""
+        self._render_cache.clear()
+        self._gauge_state = None
+    
+    def _cached_render(self, command, render, args):
+        """Rendered output for the current state version and output mode"""
+        version = self._pinned_version
+        if version is None:
+            version = self.refresh_state_version()
+        key = (command, self.is_mobile)
+        cached = self._render_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        text = render(args)
+        self._render_cache[key] = (version, text)
+        return text
+    
+    def compact_state(self, since=None, epoch=None):
+        """
+        Gauge state in the compact wire format
+        
+        Keys: i (state epoch), v (state version), l (gas level), s (status),
+        w (warning threshold), h (hard stop threshold). A client that saw
+        version `since` of the same epoch gets only the version and the
+        fields that changed since - just {"v": n} when nothing did. Without
+        a matching epoch the full state is returned.
+        
+        Args:
+            since (int): Last state version the client holds
+            epoch (str): Epoch that version belongs to (the "i" it was sent with)
+            
+        Returns:
+            dict: Full state, or a delta against `since`
+        """
+        version = self._pinned_version
+        if version is None:
+            version = self.refresh_state_version()
+        current = self._compact_history.get(version)
+        if current is None:
+            current = self._compact_history[version] = self._render_compact()
+            while len(self._compact_history) > COMPACT_HISTORY:
+                self._compact_history.popitem(last=False)
+        
+        # Versions restart with each session: a delta needs the client's epoch
+        previous = self._compact_history.get(since) if epoch == self.state_epoch else None
+        if previous is None:
+            return dict(current, i=self.state_epoch, v=version)
+        delta = {"v": version}
+        for key, value in current.items():
+            if previous[key] != value:
+                delta[key] = value
+        return delta
+    
+    def _render_compact(self):
+        """Compact fields for the current gauge state"""
+        if not self.initialized or not self.gas_gauge:
+            return {"l": None, "s": "UNINITIALIZED", "w": None, "h": None}
+        gas_info = self.gas_gauge.check_gas()
+        thresholds = getattr(self.gas_gauge, "resource_map", {}).get("thresholds", {})
+        return {
+            "l": gas_info["level"],
+            "s": gas_info["status"],
+            "w": thresholds.get("long_chats_warning"),
+            "h": thresholds.get("hard_stop")
+        }
+    
+    def _cmd_compact(self, args):
+        """Compact state command: /c [epoch:version] (delta since that version)"""
+        epoch, _, since = args.strip().rpartition(":")
+        since = int(since) if epoch and since.isdigit() else None
+        return json.dumps(self.compact_state(since, epoch or None), separators=(",", ":"), ensure_ascii=False)
+    
     def _cmd_check_gas(self, args):
         """Check gas level command"""
         if not self.initialized or not self.gas_gauge:
             return "⚠️ Gas gauge not initialized. Run /i first."
         
-        # Check gas level
+        # Always take the reading (gauges record each check); only the
+        # formatting is reused while the reading is unchanged
         gas_info = self.gas_gauge.check_gas()
-        
+        reading = (gas_info["level"], gas_info["status"], gas_info.get("gauge"))
+        key = ("/g", self.is_mobile)
+        cached = self._render_cache.get(key)
+        if cached is not None and cached[0] == reading:
+            return cached[1]
+        text = self._format_gas(gas_info)
+        self._render_cache[key] = (reading, text)
+        return text
+    
+    def _render_gas(self, args):
+        """Render /g output"""
+        return self._format_gas(self.gas_gauge.check_gas())
+    
+    def _format_gas(self, gas_info):
+        """Format a check_gas() reading"""
         # Format minimal output for mobile
         if self.is_mobile:
             return f"🔋 Gas: {gas_info['level']}% - {gas_info['status']}"
@@ -169,9 +403,14 @@ class MobileSession:
         if not self.initialized or not self.gas_gauge:
             return "⚠️ TeamBadass not initialized. Run /i first."
         
+        return self._cached_render("/s", self._render_status, args)
+    
+    def _render_status(self, args):
+        """Render /s output"""
         # Get current status
         try:
-            from teambadass._memory.gas_gauge.gauge_reporting import ClaudeGasGauge
+            if not _load_gauge_reporting():
+                raise ImportError(f"No module named '{GAUGE_REPORTING_MODULE}'")
             status = self.gas_gauge.format_status_report()
             
             # For mobile, create a more compact version
@@ -192,7 +431,7 @@ class MobileSession:
                 return status
         except Exception as e:
             # Fallback to basic status
-            return self._cmd_check_gas(args)
+            return self._render_gas(args)
     
     def _cmd_pre_task(self, args):
         """Perform pre-task assessment command"""
@@ -200,8 +439,7 @@ class MobileSession:
             return "⚠️ TeamBadass not initialized. Run /i first."
         
         # Parse arguments
-        args_pattern = r"(\w+)\s+(\w+)\s+(\w+)"
-        match = re.match(args_pattern, args)
+        match = _PRE_TASK_ARGS.match(args)
         
         if not match:
             return "Usage: /p task_type complexity size\nExample: /p code medium large"
@@ -239,12 +477,15 @@ class MobileSession:
             "/i - Initialize or reinitialize",
             "/s - Show detailed status",
             "/p [task] [complexity] [size] - Pre-task assessment",
+            "/c [epoch:version] - Compact state (JSON delta since version)",
             "/h - Show this help"
         ]
         return "\n".join(help_text)
 
 # Main execution - this can be used for testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')  # Simplified format for mobile
+    
     # Create mobile session handler
     session = MobileSession()
     
@@ -252,6 +493,9 @@ if __name__ == "__main__":
     print("🚀 Initializing TeamBadass Mobile...")
     init_result = session.initialize()
     print(init_result["message"])
+    if PROFILER.enabled and session.is_mobile:
+        # The desktop report already ends with the breakdown
+        print(PROFILER.format_report())
     
     # Test command processing
     test_commands = ["/g", "/s", "/p code medium large", "/h"]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Multi-process stress test for metrics_log.py
+
+Starts N processes that each save a tracker's metrics repeatedly into
+the same metrics directory, then checks that no records, op counts or
+costs were lost and that the summary matches a full replay of the log.
+
+Usage: python multiprocess-metrics-stress.py [processes] [saves_per_process] [--unsafe]
+    --unsafe  Disable the advisory lock to show what goes missing without it
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import multiprocessing
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+OPERATIONS = [("code", "low", "small"), ("discuss", None, 100), ("plan", "low", None), ("search", 2, None)]
+
+
+def worker(directory, saves, multi_writer, start_event):
+    """Register one operation and save, `saves` times, against a shared log"""
+    from metrics_log import SegmentedMetricsLog
+    from minimal_tracker import MinimalTracker
+
+    os.chdir(directory)
+    tracker = MinimalTracker(silent=True, metrics_store=SegmentedMetricsLog("metrics", multi_writer=multi_writer))
+    start_event.wait()
+    errors = []
+    for i in range(saves):
+        tracker.register(*OPERATIONS[i % len(OPERATIONS)])
+        result = tracker.save_metrics()
+        if result["status"] != "success":
+            errors.append(result["message"])
+    if errors:
+        print(f"{len(errors)} failed saves in process {os.getpid()} (last: {errors[-1]})")
+
+
+def expected_totals(process_count, saves):
+    """Op counts and costs a lossless run must end with"""
+    from cost_model import CostModel
+
+    model = CostModel.load()
+    totals = {}
+    for i in range(saves):
+        op = OPERATIONS[i % len(OPERATIONS)]
+        entry = totals.setdefault(op[0], {"count": 0, "total_cost": 0.0})
+        entry["count"] += process_count
+        entry["total_cost"] += model.cost(*op) * process_count
+    return totals
+
+
+def verify(directory, process_count, saves):
+    """Compare the summary and the raw log against the expected totals"""
+    from metrics_log import SegmentedMetricsLog
+
+    log = SegmentedMetricsLog(os.path.join(directory, "metrics"))
+    summary = log.summary()
+    records = list(log.records())
+    expected = expected_totals(process_count, saves)
+
+    problems = []
+    if len(records) != process_count * saves:
+        problems.append(f"{process_count * saves - len(records)} records lost")
+    if log.manifest["total_records"] != len(records):
+        problems.append(f"manifest counts {log.manifest['total_records']} of {len(records)} records")
+    for op_type, data in expected.items():
+        actual = summary["operations"].get(op_type, {"count": 0, "total_cost": 0})
+        if actual["count"] != data["count"]:
+            problems.append(f"{op_type}: {data['count'] - actual['count']} op counts lost")
+        elif abs(actual["total_cost"] - data["total_cost"]) > 1e-6 * data["total_cost"]:
+            problems.append(f"{op_type}: cost {actual['total_cost']:.1f} != {data['total_cost']:.1f}")
+    sessions = {record["session_id"] for record in records}
+    if len(sessions) != process_count:
+        problems.append(f"{len(sessions)} of {process_count} sessions in the log")
+    return problems
+
+
+def run_stress(process_count=8, saves=200, multi_writer=True):
+    directory = tempfile.mkdtemp(prefix="gas-mp-stress-")
+    try:
+        start_event = multiprocessing.Event()
+        processes = [multiprocessing.Process(target=worker, args=(directory, saves, multi_writer, start_event))
+                     for _ in range(process_count)]
+        for process in processes:
+            process.start()
+        started = time.perf_counter()
+        start_event.set()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        try:
+            problems = verify(directory, process_count, saves)
+        except ValueError as e:
+            problems = [f"log corrupted ({e})"]
+        mode = "locked" if multi_writer else "unlocked"
+        rate = process_count * saves / elapsed
+        print(f"{process_count} processes x {saves} saves ({mode}): {rate:,.0f} saves/sec")
+        if problems:
+            print("❌ " + "; ".join(problems))
+        else:
+            print("✅ No lost updates")
+        return not problems
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    processes = int(args[0]) if len(args) > 0 else 8
+    saves = int(args[1]) if len(args) > 1 else 200
+    ok = run_stress(processes, saves, multi_writer="--unsafe" not in sys.argv)
+    sys.exit(0 if ok else 1)
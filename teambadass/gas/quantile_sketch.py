@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: quantile_sketch.py - Mergeable streaming quantile sketch for op costs
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: None
+IMPORTED_BY: minimal_tracker.py, metrics_log.py, sqlite_store.py
+
+TABLE_OF_CONTENTS:
+1. CostSketch Class - Log-bucketed sketch with relative-error quantiles
+2. Updates - O(1) add(), bounded bins (lowest buckets collapse)
+3. Merging - Bucket counts add across sessions; difference() for save deltas
+4. Serialization - Compact dict for JSON/SQLite persistence
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Values land in bucket ceil(log(x) / log(gamma)) with
+gamma = (1 + accuracy) / (1 - accuracy), so any reported quantile is
+within `accuracy` (relative) of a true sample value. Non-positive
+values share a single zero bucket.
+"""
+
+import math
+
+DEFAULT_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+BANDS = (0.5, 0.9, 0.95)
+
+
+class CostSketch:
+    """Streaming, mergeable quantile sketch over positive costs"""
+
+    __slots__ = ("accuracy", "max_bins", "gamma", "_log_gamma", "bins", "zero_count", "count",
+                 "min", "max")
+
+    def __init__(self, accuracy=DEFAULT_ACCURACY, max_bins=DEFAULT_MAX_BINS):
+        """
+        Create an empty sketch
+
+        Args:
+            accuracy (float): Relative accuracy of reported quantiles
+            max_bins (int): Bucket limit; lowest buckets collapse beyond it
+        """
+        self.accuracy = accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value, count=1):
+        """Record a value (O(1) amortized)"""
+        if value > 0:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            bins = self.bins
+            bins[key] = bins.get(key, 0) + count
+            if len(bins) > self.max_bins:
+                self._collapse()
+        else:
+            self.zero_count += count
+        self.count += count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Fold another sketch (same accuracy) into this one"""
+        if other.count == 0:
+            return self
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        bins = self.bins
+        for key, count in other.bins.items():
+            bins[key] = bins.get(key, 0) + count
+        if len(bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def difference(self, earlier):
+        """
+        Sketch of the values added since an earlier copy of this sketch
+
+        Args:
+            earlier (CostSketch): Previous snapshot of this same sketch
+
+        Returns:
+            CostSketch: Values recorded after the snapshot
+        """
+        delta = CostSketch(self.accuracy, self.max_bins)
+        for key, count in self.bins.items():
+            remaining = count - earlier.bins.get(key, 0)
+            if remaining > 0:
+                delta.bins[key] = remaining
+        delta.zero_count = max(self.zero_count - earlier.zero_count, 0)
+        delta.count = sum(delta.bins.values()) + delta.zero_count
+        if delta.count:
+            delta.min, delta.max = self.min, self.max
+        return delta
+
+    def copy(self):
+        """Independent copy of this sketch"""
+        return CostSketch(self.accuracy, self.max_bins).merge(self)
+
+    def quantile(self, q):
+        """
+        Approximate q-quantile of recorded values
+
+        Args:
+            q (float): Quantile in [0, 1]
+
+        Returns:
+            float: Value estimate (None if the sketch is empty)
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return min(self.min, 0.0)
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def bands(self, quantiles=BANDS):
+        """Percentile bands as {"p50": ..., "p90": ..., "p95": ...}"""
+        return {f"p{round(q * 100)}": round(self.quantile(q), 1) for q in quantiles}
+
+    def to_dict(self):
+        """Compact serializable form"""
+        keys = sorted(self.bins)
+        return {
+            "a": self.accuracy,
+            "n": self.count,
+            "z": self.zero_count,
+            "min": self.min,
+            "max": self.max,
+            "k": keys,
+            "c": [self.bins[key] for key in keys]
+        }
+
+    @classmethod
+    def from_dict(cls, data, max_bins=DEFAULT_MAX_BINS):
+        """Rebuild a sketch from to_dict() output"""
+        sketch = cls(data["a"], max_bins)
+        sketch.bins = dict(zip(data["k"], data["c"]))
+        sketch.zero_count = data["z"]
+        sketch.count = data["n"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
+
+    def _collapse(self):
+        """Fold the lowest buckets together to respect max_bins"""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.bins[target] += self.bins.pop(key)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: snapshot.py - Compact binary snapshot of tracker state for session hops
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: quantile_sketch.py
+IMPORTED_BY: minimal_tracker.py
+
+TABLE_OF_CONTENTS:
+1. Format - Versioned little-endian header, op tables, sketches, CRC32 trailer
+2. encode()/write() - Whole snapshot built in memory, one write, atomic replace
+3. decode()/read() - struct.unpack_from straight off an mmap of the file
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Layout (all little-endian):
+    header      HEADER (magic, format version, scalars, section sizes)
+    session_id  UTF-8 bytes
+    operations  per op: u16 name length, name, i64 count, f64 total cost
+    saved ops   same layout (what the metrics log already holds)
+    sketches    per op: u16 name length, name, SKETCH, i64 keys, i64 counts
+    saved       same layout
+    crc32       u32 over everything above
+"""
+
+import os
+import math
+import mmap
+import zlib
+import struct
+
+from quantile_sketch import CostSketch
+
+MAGIC = b"GASS"
+FORMAT_VERSION = 1
+
+WARNING_OBSERVED = 1
+HARD_STOP_OBSERVED = 2
+
+# magic, version, reserved, usage, warning, hard_stop, start, warning time,
+# hard stop time, observed flags, session_id length, 4 section entry counts
+HEADER = struct.Struct("<4sHHddddddBHIIII")
+NAME = struct.Struct("<H")
+OP = struct.Struct("<qd")
+# accuracy, count, zero count, min, max, bin count
+SKETCH = struct.Struct("<dqqddI")
+CRC = struct.Struct("<I")
+
+_NAN = float("nan")
+
+
+def encode(state):
+    """
+    Serialize a state dict (see decode()) to bytes
+
+    Args:
+        state (dict): usage, thresholds, start, warning_time, hard_stop_time,
+            warning_observed, hard_stop_observed, session_id, operations,
+            saved_operations, sketches, saved_sketches
+
+    Returns:
+        bytes: Snapshot including the CRC trailer
+    """
+    session_id = state["session_id"].encode("utf-8")
+    flags = (WARNING_OBSERVED if state["warning_observed"] else 0) | \
+            (HARD_STOP_OBSERVED if state["hard_stop_observed"] else 0)
+
+    buffer = bytearray(HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0,
+        state["usage"], state["thresholds"]["warning"], state["thresholds"]["hard_stop"],
+        state["start"], _optional(state["warning_time"]), _optional(state["hard_stop_time"]),
+        flags, len(session_id),
+        len(state["operations"]), len(state["saved_operations"]),
+        len(state["sketches"]), len(state["saved_sketches"])
+    ))
+    buffer += session_id
+    for operations in (state["operations"], state["saved_operations"]):
+        for op_type, data in operations.items():
+            _pack_name(buffer, op_type)
+            buffer += OP.pack(data["count"], data["total_cost"])
+    for sketches in (state["sketches"], state["saved_sketches"]):
+        for op_type, sketch in sketches.items():
+            _pack_name(buffer, op_type)
+            keys = sorted(sketch.bins)
+            buffer += SKETCH.pack(sketch.accuracy, sketch.count, sketch.zero_count,
+                                  _optional(sketch.min), _optional(sketch.max), len(keys))
+            buffer += struct.pack(f"<{len(keys)}q", *keys)
+            buffer += struct.pack(f"<{len(keys)}q", *(sketch.bins[key] for key in keys))
+    buffer += CRC.pack(zlib.crc32(buffer))
+    return bytes(buffer)
+
+
+def decode(data):
+    """
+    Parse a snapshot from any buffer (bytes, mmap, memoryview)
+
+    Returns:
+        dict: State in the shape accepted by encode()
+
+    Raises:
+        ValueError: Wrong magic, unsupported version or failed checksum
+    """
+    if len(data) < HEADER.size + CRC.size:
+        raise ValueError("Snapshot truncated")
+    (magic, version, _, usage, warning, hard_stop, start, warning_time, hard_stop_time,
+     flags, id_length, n_ops, n_saved_ops, n_sketches, n_saved_sketches) = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a tracker snapshot")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    end = len(data) - CRC.size
+    with memoryview(data) as view:
+        if zlib.crc32(view[:end]) != CRC.unpack_from(data, end)[0]:
+            raise ValueError("Snapshot checksum mismatch")
+
+    offset = HEADER.size
+    session_id = bytes(data[offset:offset + id_length]).decode("utf-8")
+    offset += id_length
+
+    operations, offset = _unpack_ops(data, offset, n_ops)
+    saved_operations, offset = _unpack_ops(data, offset, n_saved_ops)
+    sketches, offset = _unpack_sketches(data, offset, n_sketches)
+    saved_sketches, offset = _unpack_sketches(data, offset, n_saved_sketches)
+
+    return {
+        "version": version,
+        "session_id": session_id,
+        "usage": usage,
+        "thresholds": {"warning": warning, "hard_stop": hard_stop},
+        "start": start,
+        "warning_time": _required(warning_time),
+        "hard_stop_time": _required(hard_stop_time),
+        "warning_observed": bool(flags & WARNING_OBSERVED),
+        "hard_stop_observed": bool(flags & HARD_STOP_OBSERVED),
+        "operations": operations,
+        "saved_operations": saved_operations,
+        "sketches": sketches,
+        "saved_sketches": saved_sketches
+    }
+
+
+def write(path, state):
+    """Write a snapshot (state dict or encode() output) with a single write, then atomically replace path"""
+    data = state if isinstance(state, (bytes, bytearray)) else encode(state)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Per-process temp name: concurrent writers never share a temp file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def read(path):
+    """Decode a snapshot file directly from an mmap of it"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Snapshot truncated")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode(mapped)
+
+
+def _pack_name(buffer, name):
+    encoded = name.encode("utf-8")
+    buffer += NAME.pack(len(encoded))
+    buffer += encoded
+
+
+def _unpack_name(data, offset):
+    (length,) = NAME.unpack_from(data, offset)
+    offset += NAME.size
+    return bytes(data[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def _unpack_ops(data, offset, count):
+    operations = {}
+    for _ in range(count):
+        op_type, offset = _unpack_name(data, offset)
+        op_count, total_cost = OP.unpack_from(data, offset)
+        offset += OP.size
+        operations[op_type] = {"count": op_count, "total_cost": total_cost}
+    return operations, offset
+
+
+def _unpack_sketches(data, offset, count):
+    sketches = {}
+    for _ in range(count):
+        op_type, offset = _unpack_name(data, offset)
+        accuracy, total, zero_count, low, high, n_bins = SKETCH.unpack_from(data, offset)
+        offset += SKETCH.size
+        keys = struct.unpack_from(f"<{n_bins}q", data, offset)
+        offset += 8 * n_bins
+        counts = struct.unpack_from(f"<{n_bins}q", data, offset)
+        offset += 8 * n_bins
+
+        sketch = CostSketch(accuracy)
+        sketch.bins = dict(zip(keys, counts))
+        sketch.count = total
+        sketch.zero_count = zero_count
+        sketch.min = _required(low)
+        sketch.max = _required(high)
+        sketches[op_type] = sketch
+    return sketches, offset
+
+
+def _optional(value):
+    """None -> NaN for fixed-width float fields"""
+    return _NAN if value is None else value
+
+
+def _required(value):
+    return None if math.isnan(value) else value
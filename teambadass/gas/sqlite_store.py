@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: sqlite_store.py - SQLite-backed indexed metrics store
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: sqlite3 (standard library), metrics_log.py, quantile_sketch.py
+IMPORTED_BY: None (pass to MinimalTracker(metrics_store=...))
+
+TABLE_OF_CONTENTS:
+1. SQLiteMetricsStore Class - Drop-in replacement for SegmentedMetricsLog
+2. Schema - Indexed sessions, per-session op aggregates, threshold observations, op rollups
+3. Flush - One transaction per append, bulk upserts, rollups advanced by the op delta
+4. Query Helpers - Date ranges, op totals, hard-stop sessions
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+from metrics_log import DURABILITY_LEVELS, RECENT_SESSIONS, RECENT_THRESHOLDS
+from quantile_sketch import CostSketch
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    start_time TEXT,
+    end_time TEXT,
+    duration_mins REAL,
+    usage REAL,
+    warning REAL,
+    hard_stop REAL,
+    warning_observed INTEGER NOT NULL DEFAULT 0,
+    warning_time TEXT,
+    hard_stop_observed INTEGER NOT NULL DEFAULT 0,
+    hard_stop_time TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions (date);
+CREATE INDEX IF NOT EXISTS idx_sessions_end ON sessions (end_time);
+CREATE INDEX IF NOT EXISTS idx_sessions_hard_stop ON sessions (date) WHERE hard_stop_observed = 1;
+
+CREATE TABLE IF NOT EXISTS session_operations (
+    session_id TEXT NOT NULL,
+    op_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total_cost REAL NOT NULL,
+    sketch TEXT,
+    PRIMARY KEY (session_id, op_type)
+);
+CREATE INDEX IF NOT EXISTS idx_session_operations_op ON session_operations (op_type);
+
+CREATE TABLE IF NOT EXISTS thresholds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    observed_at TEXT NOT NULL,
+    warning REAL NOT NULL,
+    hard_stop REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_thresholds_session_id ON thresholds (session_id);
+
+CREATE TABLE IF NOT EXISTS operation_rollups (
+    op_type TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    total_cost REAL NOT NULL,
+    sketch TEXT
+);
+"""
+
+# Durability level -> SQLite synchronous pragma
+SYNCHRONOUS = {"none": "OFF", "fsync": "NORMAL", "atomic": "FULL"}
+
+SESSION_COLUMNS = ("session_id, date, start_time, end_time, duration_mins, usage, warning, hard_stop, "
+                   "warning_observed, warning_time, hard_stop_observed, hard_stop_time")
+
+
+class SQLiteMetricsStore:
+    """Unlimited session history in an indexed SQLite database"""
+
+    def __init__(self, path="metrics/metrics.sqlite3", durability="fsync"):
+        """
+        Open (or create) the metrics database
+
+        Args:
+            path (str): Database file (":memory:" for tests)
+            durability (str): One of DURABILITY_LEVELS
+        """
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._durability = None
+        self.durability = durability
+
+    @property
+    def durability(self):
+        return self._durability
+
+    @durability.setter
+    def durability(self, durability):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability: {durability}")
+        with self._lock:
+            self._conn.execute(f"PRAGMA synchronous={SYNCHRONOUS[durability]}")
+        self._durability = durability
+
+    def append(self, record, op_delta):
+        """
+        Upsert a session record in a single transaction
+
+        Args:
+            record (dict): Session record from MinimalTracker._session_record()
+            op_delta (dict): Per-op counts/costs/sketches not yet in the rollups
+
+        Returns:
+            str: Database path
+        """
+        session = (
+            record["session_id"], record["date"], record["start"], record["end"],
+            record["duration_mins"], record["usage"],
+            record["thresholds"]["warning"], record["thresholds"]["hard_stop"],
+            int(record["warning_observed"]), record["warning_time"],
+            int(record["hard_stop_observed"]), record["hard_stop_time"]
+        )
+        sketches = record.get("sketches", {})
+        operations = [
+            (record["session_id"], op_type, data["count"], data["total_cost"],
+             json.dumps(sketches[op_type], separators=(",", ":")) if op_type in sketches else None)
+            for op_type, data in record["operations"].items()
+        ]
+        rollups = [(op_type, data["count"], data["total_cost"]) for op_type, data in op_delta.items()]
+        sketch_deltas = {op_type: data["sketch"] for op_type, data in op_delta.items() if "sketch" in data}
+
+        with self._lock, self._conn:
+            self._conn.execute(f"INSERT OR REPLACE INTO sessions ({SESSION_COLUMNS}) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", session)
+            self._conn.executemany("INSERT OR REPLACE INTO session_operations "
+                                   "(session_id, op_type, count, total_cost, sketch) VALUES (?, ?, ?, ?, ?)",
+                                   operations)
+            # One row per session; replacing it moves the session to the newest id
+            self._conn.execute("INSERT OR REPLACE INTO thresholds (session_id, observed_at, warning, hard_stop) "
+                               "VALUES (?, ?, ?, ?)", (record["session_id"], record["end"],
+                                                       record["thresholds"]["warning"],
+                                                       record["thresholds"]["hard_stop"]))
+            self._conn.executemany("INSERT INTO operation_rollups (op_type, count, total_cost) VALUES (?, ?, ?) "
+                                   "ON CONFLICT (op_type) DO UPDATE SET count = count + excluded.count, "
+                                   "total_cost = total_cost + excluded.total_cost", rollups)
+            if sketch_deltas:
+                self._merge_rollup_sketches(sketch_deltas)
+        return self.path
+
+    def summary(self):
+        """
+        Return rollups in the shape of the old capacity_metrics.json
+
+        Returns:
+            dict: sessions, thresholds, operations, sketches, avg_warning, avg_hard_stop
+        """
+        sessions = self._query_sessions(f"SELECT {SESSION_COLUMNS} FROM sessions "
+                                        "ORDER BY end_time DESC LIMIT ?", (RECENT_SESSIONS,))
+        sessions.reverse()
+        rows = self._query("SELECT warning, hard_stop FROM thresholds ORDER BY id DESC LIMIT ?",
+                           (RECENT_THRESHOLDS,))
+        thresholds = [{"warning": row["warning"], "hard_stop": row["hard_stop"]} for row in reversed(rows)]
+
+        rollups = self._query("SELECT op_type, count, total_cost, sketch FROM operation_rollups")
+
+        result = {
+            "sessions": sessions,
+            "thresholds": thresholds,
+            "operations": {row["op_type"]: {"count": row["count"], "total_cost": row["total_cost"]}
+                           for row in rollups},
+            "sketches": {row["op_type"]: json.loads(row["sketch"]) for row in rollups if row["sketch"]}
+        }
+        if thresholds:
+            result["avg_warning"] = sum(t["warning"] for t in thresholds) / len(thresholds)
+            result["avg_hard_stop"] = sum(t["hard_stop"] for t in thresholds) / len(thresholds)
+        return result
+
+    def records(self):
+        """Every stored session, oldest first"""
+        return self._query_sessions(f"SELECT {SESSION_COLUMNS} FROM sessions ORDER BY end_time")
+
+    def sessions_between(self, start_date, end_date):
+        """
+        Sessions whose date falls in an inclusive range
+
+        Args:
+            start_date (str): YYYY-MM-DD
+            end_date (str): YYYY-MM-DD
+
+        Returns:
+            list: Session records, oldest first
+        """
+        return self._query_sessions(f"SELECT {SESSION_COLUMNS} FROM sessions "
+                                    "WHERE date BETWEEN ? AND ? ORDER BY end_time", (start_date, end_date))
+
+    def hard_stop_sessions(self, start_date=None, end_date=None):
+        """Sessions that reached the hard stop, optionally within a date range"""
+        sql = f"SELECT {SESSION_COLUMNS} FROM sessions WHERE hard_stop_observed = 1"
+        params = ()
+        if start_date and end_date:
+            sql += " AND date BETWEEN ? AND ?"
+            params = (start_date, end_date)
+        return self._query_sessions(sql + " ORDER BY end_time", params)
+
+    def operation_totals(self, op_type=None, start_date=None, end_date=None):
+        """
+        Per-op count/cost totals across sessions
+
+        Args:
+            op_type (str): Restrict to one op type
+            start_date (str): Optional inclusive YYYY-MM-DD lower bound
+            end_date (str): Optional inclusive YYYY-MM-DD upper bound
+
+        Returns:
+            dict: op_type -> {"count", "total_cost"}
+        """
+        if not (start_date and end_date):
+            sql, params = "SELECT op_type, count, total_cost FROM operation_rollups", ()
+            if op_type:
+                sql, params = sql + " WHERE op_type = ?", (op_type,)
+            return {row["op_type"]: {"count": row["count"], "total_cost": row["total_cost"]}
+                    for row in self._query(sql, params)}
+
+        sql = "SELECT o.op_type, SUM(o.count) AS count, SUM(o.total_cost) AS total_cost FROM session_operations o"
+        where, params = [], []
+        if start_date and end_date:
+            sql += " JOIN sessions s ON s.session_id = o.session_id"
+            where.append("s.date BETWEEN ? AND ?")
+            params += [start_date, end_date]
+        if op_type:
+            where.append("o.op_type = ?")
+            params.append(op_type)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self._query(sql + " GROUP BY o.op_type", params)
+        return {row["op_type"]: {"count": row["count"], "total_cost": row["total_cost"]} for row in rows}
+
+    def operation_sketches(self, op_type=None, start_date=None, end_date=None):
+        """
+        Per-op cost sketches merged across sessions
+
+        Args:
+            op_type (str): Restrict to one op type
+            start_date (str): Optional inclusive YYYY-MM-DD lower bound
+            end_date (str): Optional inclusive YYYY-MM-DD upper bound
+
+        Returns:
+            dict: op_type -> CostSketch
+        """
+        if not (start_date and end_date):
+            sql, params = "SELECT op_type, sketch FROM operation_rollups WHERE sketch IS NOT NULL", ()
+            if op_type:
+                sql, params = sql + " AND op_type = ?", (op_type,)
+            return {row["op_type"]: CostSketch.from_dict(json.loads(row["sketch"]))
+                    for row in self._query(sql, params)}
+
+        sql = "SELECT o.op_type, o.sketch FROM session_operations o"
+        where, params = ["o.sketch IS NOT NULL"], []
+        if start_date and end_date:
+            sql += " JOIN sessions s ON s.session_id = o.session_id"
+            where.append("s.date BETWEEN ? AND ?")
+            params += [start_date, end_date]
+        if op_type:
+            where.append("o.op_type = ?")
+            params.append(op_type)
+
+        sketches = {}
+        for row in self._query(sql + " WHERE " + " AND ".join(where), params):
+            sketch = CostSketch.from_dict(json.loads(row["sketch"]))
+            if row["op_type"] in sketches:
+                sketches[row["op_type"]].merge(sketch)
+            else:
+                sketches[row["op_type"]] = sketch
+        return sketches
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _merge_rollup_sketches(self, sketch_deltas):
+        """Fold per-op sketch deltas into the rollups (caller holds the lock and transaction)"""
+        placeholders = ", ".join("?" * len(sketch_deltas))
+        stored = {row["op_type"]: row["sketch"] for row in self._conn.execute(
+            f"SELECT op_type, sketch FROM operation_rollups WHERE op_type IN ({placeholders})", list(sketch_deltas))}
+        updates = []
+        for op_type, delta in sketch_deltas.items():
+            sketch = CostSketch.from_dict(delta)
+            if stored.get(op_type):
+                sketch.merge(CostSketch.from_dict(json.loads(stored[op_type])))
+            updates.append((json.dumps(sketch.to_dict(), separators=(",", ":")), op_type))
+        self._conn.executemany("UPDATE operation_rollups SET sketch = ? WHERE op_type = ?", updates)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _query_sessions(self, sql, params=()):
+        """Run a sessions query and rebuild records with their operations"""
+        rows = self._query(sql, params)
+        if not rows:
+            return []
+
+        ids = [row["session_id"] for row in rows]
+        operations = {session_id: {} for session_id in ids}
+        # Chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for op in self._query("SELECT session_id, op_type, count, total_cost FROM session_operations "
+                                  f"WHERE session_id IN ({placeholders})", chunk):
+                operations[op["session_id"]][op["op_type"]] = {"count": op["count"], "total_cost": op["total_cost"]}
+
+        return [{
+            "date": row["date"],
+            "session_id": row["session_id"],
+            "start": row["start_time"],
+            "end": row["end_time"],
+            "duration_mins": row["duration_mins"],
+            "operations": operations[row["session_id"]],
+            "usage": row["usage"],
+            "thresholds": {"warning": row["warning"], "hard_stop": row["hard_stop"]},
+            "warning_observed": bool(row["warning_observed"]),
+            "warning_time": row["warning_time"],
+            "hard_stop_observed": bool(row["hard_stop_observed"]),
+            "hard_stop_time": row["hard_stop_time"]
+        } for row in rows]
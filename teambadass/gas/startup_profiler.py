@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: startup_profiler.py - Phase timing for gas package cold start
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: None
+IMPORTED_BY: auto_init.py, mobile_integration.py
+
+TABLE_OF_CONTENTS:
+1. StartupProfiler Class - Named phase timings checked against a budget
+2. PROFILER - Process-wide instance used by the entry points
+3. Enabling - GAS_PROFILE_STARTUP=1, --profile-startup, or enable()
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+
+Phases: import, detect_repository, initialize_gas_gauge, load_memory.
+Disabled (the default), phases record nothing.
+"""
+
+import os
+import sys
+import time
+import functools
+from contextlib import contextmanager
+
+PROFILE_ENV = "GAS_PROFILE_STARTUP"
+BUDGET_ENV = "GAS_STARTUP_BUDGET_MS"
+PROFILE_FLAG = "--profile-startup"
+DEFAULT_BUDGET_MS = 50.0
+
+
+class StartupProfiler:
+    """Accumulates wall time per startup phase"""
+
+    def __init__(self, enabled=None, budget_ms=None):
+        """
+        Args:
+            enabled (bool): Record phases (defaults to env var / command-line flag)
+            budget_ms (float): Cold start budget (defaults to GAS_STARTUP_BUDGET_MS or 50)
+        """
+        if enabled is None:
+            enabled = os.environ.get(PROFILE_ENV) == "1" or PROFILE_FLAG in sys.argv
+        if budget_ms is None:
+            budget_ms = float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MS))
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self.phases = {}
+        self._active = set()
+
+    def enable(self, budget_ms=None):
+        """Start recording (phases already finished are not recovered)"""
+        self.enabled = True
+        if budget_ms is not None:
+            self.budget_ms = budget_ms
+
+    def reset(self):
+        """Forget recorded phases"""
+        self.phases.clear()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block under a phase name
+
+        Repeated phases accumulate; a phase nested in itself (an entry point
+        timing an import that times its own imports) is only counted once.
+        """
+        if not self.enabled or name in self._active:
+            yield
+            return
+        self._active.add(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    def timed(self, name):
+        """Decorator timing every call of a function as phase `name`"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def report(self):
+        """
+        Recorded phases against the budget
+
+        Returns:
+            dict: status, phases (ms), total_ms, budget_ms, over_budget
+        """
+        if not self.enabled:
+            return {"status": "error", "message": f"Startup profiling disabled (set {PROFILE_ENV}=1)"}
+        total = sum(self.phases.values())
+        return {
+            "status": "success",
+            "phases": {name: round(ms, 3) for name, ms in self.phases.items()},
+            "total_ms": round(total, 3),
+            "budget_ms": self.budget_ms,
+            "over_budget": total > self.budget_ms
+        }
+
+    def format_report(self):
+        """One-line breakdown, e.g. '⏱️ import 8.1ms | load_memory 0.4ms = 8.5ms / 50ms ✅'"""
+        report = self.report()
+        if report["status"] != "success":
+            return report["message"]
+        parts = " | ".join(f"{name} {ms:.1f}ms" for name, ms in report["phases"].items())
+        verdict = "⚠️ over budget" if report["over_budget"] else "✅"
+        return f"⏱️ {parts} = {report['total_ms']:.1f}ms / {report['budget_ms']:g}ms {verdict}"
+
+
+PROFILER = StartupProfiler()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: tracker_pool.py - Multi-session capacity tracking with compact state
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: cost_model.py, minimal_tracker.py, metrics_log.py, capacity_status.py
+IMPORTED_BY: None
+
+TABLE_OF_CONTENTS:
+1. TrackerPool Class - Column-array state for many concurrent sessions
+2. Session Lifecycle - Open, close, idle eviction, export to MinimalTracker
+3. Bulk Status - check() across every hosted session
+4. PooledSession Handle - __slots__ view with the MinimalTracker call surface
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+"""
+
+import time
+from array import array
+from datetime import datetime
+
+from capacity_status import RECOMMENDATIONS, usage_status
+from cost_model import CostModel
+from metrics_log import SegmentedMetricsLog
+from minimal_tracker import MinimalTracker, new_session_id
+
+WARNING_OBSERVED = 1
+HARD_STOP_OBSERVED = 2
+
+
+class TrackerPool:
+    """Hosts many tracker sessions as slots in typed column arrays"""
+
+    def __init__(self, capacity=1024, thresholds=None, cost_model=None, idle_timeout=None, on_evict=None,
+                 metrics_store=None):
+        """
+        Initialize an empty pool
+
+        Args:
+            capacity (int): Initial number of session slots (grows by doubling; 0 allocates on first open)
+            thresholds (dict): Default warning/hard_stop for new sessions
+            cost_model (CostModel): Shared cost model (defaults to cost_model.json)
+            idle_timeout (float): Seconds of inactivity before evict_idle() drops a session
+            on_evict (callable): Called with a MinimalTracker for each evicted session
+            metrics_store: Store given to exported trackers (segmented log in
+                metrics/ if omitted; nothing is created until a save)
+        """
+        self.thresholds = dict(thresholds or {"warning": 60.0, "hard_stop": 90.0})
+        self.cost_model = cost_model or CostModel.load()
+        self.idle_timeout = idle_timeout
+        self.on_evict = on_evict
+        self.metrics_store = metrics_store or SegmentedMetricsLog("metrics", legacy_file="capacity_metrics.json")
+        self.version = 0
+
+        self._capacity = 0
+        self._ids = []
+        self._slots = {}
+        self._free = []
+        self._usage = array("d")
+        self._warning = array("d")
+        self._hard_stop = array("d")
+        self._start = array("d")
+        self._last_active = array("d")
+        self._warning_time = array("d")
+        self._hard_stop_time = array("d")
+        self._flags = bytearray()
+
+        # One count/cost column per op type, indexed by slot
+        self._op_codes = {}
+        self._op_counts = []
+        self._op_costs = []
+
+        self._grow(capacity)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, session_id):
+        return session_id in self._slots
+
+    def sessions(self):
+        """IDs of all hosted sessions"""
+        return list(self._slots)
+
+    def open(self, session_id=None):
+        """
+        Start hosting a session
+
+        Args:
+            session_id (str): Explicit ID (a collision-free one is generated if omitted)
+
+        Returns:
+            PooledSession: Handle exposing register/estimate/check
+        """
+        session_id = session_id or new_session_id()
+        if session_id in self._slots:
+            raise ValueError(f"Session already open: {session_id}")
+        if not self._free:
+            self._grow(max(1, self._capacity * 2))
+
+        slot = self._free.pop()
+        self._ids[slot] = session_id
+        self._slots[session_id] = slot
+        self._usage[slot] = 0.0
+        self._warning[slot] = self.thresholds["warning"]
+        self._hard_stop[slot] = self.thresholds["hard_stop"]
+        self._start[slot] = time.time()
+        self._last_active[slot] = time.monotonic()
+        self._warning_time[slot] = 0.0
+        self._hard_stop_time[slot] = 0.0
+        self._flags[slot] = 0
+        for column in self._op_counts:
+            column[slot] = 0
+        for column in self._op_costs:
+            column[slot] = 0.0
+        self.version += 1
+        return PooledSession(self, slot, session_id)
+
+    def session(self, session_id):
+        """Handle for an already open session"""
+        return PooledSession(self, self._slots[session_id], session_id)
+
+    def close(self, session_id):
+        """
+        Stop hosting a session and free its slot
+
+        Returns:
+            MinimalTracker: Final session state (e.g. for save_metrics)
+        """
+        tracker = self.to_tracker(session_id)
+        slot = self._slots.pop(session_id)
+        self._ids[slot] = None
+        self._free.append(slot)
+        self.version += 1
+        return tracker
+
+    def register(self, session_id, op_type, complexity=None, size=None):
+        """Register an operation for one session (same semantics as MinimalTracker.register)"""
+        slot = self._slots[session_id]
+        cost = self.cost_model.cost(op_type, complexity, size)
+
+        code = self._op_codes.get(op_type)
+        if code is None:
+            code = self._add_op(op_type)
+        self._op_counts[code][slot] += 1
+        self._op_costs[code][slot] += cost
+
+        pre_usage = self._usage[slot]
+        usage = pre_usage + cost
+        self._usage[slot] = usage
+        self._last_active[slot] = time.monotonic()
+        self.version += 1
+
+        warning = self._warning[slot]
+        hard_stop = self._hard_stop[slot]
+        if pre_usage < warning and usage >= warning:
+            self._flags[slot] |= WARNING_OBSERVED
+            self._warning_time[slot] = time.time()
+            return f"⚠️ Session at {usage:.1f}% capacity"
+        elif pre_usage < hard_stop and usage >= hard_stop:
+            self._flags[slot] |= HARD_STOP_OBSERVED
+            self._hard_stop_time[slot] = time.time()
+            return f"🛑 Session at {usage:.1f}% capacity - critical"
+        return None
+
+    def estimate(self, session_id, task, complexity="medium", size="medium"):
+        """Estimate an operation for one session (same result as MinimalTracker.estimate)"""
+        slot = self._slots[session_id]
+        cost = self.cost_model.cost(task, complexity, size)
+        usage = self._usage[slot]
+        post_usage = usage + cost
+        status = usage_status(post_usage, self._warning[slot], self._hard_stop[slot])
+        return {
+            "cost": round(cost, 1),
+            "current": round(usage, 1),
+            "post": round(post_usage, 1),
+            "remaining": round(100 - post_usage, 1),
+            "status": status,
+            "recommendation": RECOMMENDATIONS[status],
+            "proceed": status != "CRITICAL"
+        }
+
+    def set_thresholds(self, session_id, warning=None, hard_stop=None):
+        """Override thresholds for one session"""
+        slot = self._slots[session_id]
+        if warning:
+            self._warning[slot] = warning
+        if hard_stop:
+            self._hard_stop[slot] = hard_stop
+        self.version += 1
+        return {"warning": self._warning[slot], "hard_stop": self._hard_stop[slot]}
+
+    def check(self, session_ids=None):
+        """
+        Status of many sessions in one pass over the columns
+
+        Args:
+            session_ids (list): Sessions to report (all hosted sessions if omitted)
+
+        Returns:
+            dict: session_id -> MinimalTracker.check()-style report
+        """
+        if session_ids is None:
+            session_ids = list(self._slots)
+        slots = [self._slots[session_id] for session_id in session_ids]
+
+        op_counts = [0] * len(slots)
+        for column in self._op_counts:
+            for i, slot in enumerate(slots):
+                op_counts[i] += column[slot]
+
+        now = time.time()
+        report = {}
+        for i, (session_id, slot) in enumerate(zip(session_ids, slots)):
+            usage = self._usage[slot]
+            report[session_id] = {
+                "usage": round(usage, 1),
+                "remaining": round(100 - usage, 1),
+                "status": usage_status(usage, self._warning[slot], self._hard_stop[slot]),
+                "op_count": op_counts[i],
+                "mins": round((now - self._start[slot]) / 60, 1)
+            }
+        return report
+
+    def operation_totals(self):
+        """Per-op count/cost totals across all hosted sessions"""
+        slots = list(self._slots.values())
+        totals = {}
+        for op_type, code in list(self._op_codes.items()):
+            counts, costs = self._op_counts[code], self._op_costs[code]
+            totals[op_type] = {
+                "count": sum(counts[slot] for slot in slots),
+                "total_cost": sum(costs[slot] for slot in slots)
+            }
+        return totals
+
+    def status_counts(self):
+        """Number of hosted sessions in each status"""
+        counts = {"NORMAL": 0, "CAUTION": 0, "WARNING": 0, "CRITICAL": 0}
+        for slot in list(self._slots.values()):
+            counts[usage_status(self._usage[slot], self._warning[slot], self._hard_stop[slot])] += 1
+        return counts
+
+    def crossing_counts(self):
+        """Number of hosted sessions that crossed each threshold"""
+        counts = {"warning": 0, "hard_stop": 0}
+        for slot in list(self._slots.values()):
+            flags = self._flags[slot]
+            counts["warning"] += bool(flags & WARNING_OBSERVED)
+            counts["hard_stop"] += bool(flags & HARD_STOP_OBSERVED)
+        return counts
+
+    def oldest_start(self):
+        """Start time (epoch seconds) of the longest-running session, or None"""
+        slots = list(self._slots.values())
+        return min(self._start[slot] for slot in slots) if slots else None
+
+    def evict_idle(self, max_idle=None):
+        """
+        Close sessions idle for longer than max_idle seconds
+
+        Args:
+            max_idle (float): Idle limit (defaults to the pool's idle_timeout)
+
+        Returns:
+            list: IDs of evicted sessions
+        """
+        max_idle = self.idle_timeout if max_idle is None else max_idle
+        if max_idle is None:
+            return []
+
+        cutoff = time.monotonic() - max_idle
+        idle = [session_id for session_id, slot in self._slots.items() if self._last_active[slot] < cutoff]
+        for session_id in idle:
+            tracker = self.close(session_id)
+            if self.on_evict:
+                self.on_evict(tracker)
+        return idle
+
+    def to_tracker(self, session_id):
+        """Materialize one session as a standalone MinimalTracker"""
+        slot = self._slots[session_id]
+        tracker = MinimalTracker(silent=True, cost_model=self.cost_model, metrics_store=self.metrics_store)
+        tracker.session_id = session_id
+        tracker.usage = self._usage[slot]
+        tracker.thresholds = {"warning": self._warning[slot], "hard_stop": self._hard_stop[slot]}
+        tracker.start_time = datetime.fromtimestamp(self._start[slot])
+        for op_type, code in self._op_codes.items():
+            count = self._op_counts[code][slot]
+            if count:
+                tracker.operations[op_type] = {"count": count, "total_cost": self._op_costs[code][slot]}
+
+        flags = self._flags[slot]
+        tracker.warning_observed = bool(flags & WARNING_OBSERVED)
+        tracker.hard_stop_observed = bool(flags & HARD_STOP_OBSERVED)
+        if tracker.warning_observed:
+            tracker.warning_time = datetime.fromtimestamp(self._warning_time[slot])
+        if tracker.hard_stop_observed:
+            tracker.hard_stop_time = datetime.fromtimestamp(self._hard_stop_time[slot])
+        return tracker
+
+    def _add_op(self, op_type):
+        """Allocate count/cost columns for a newly seen op type"""
+        code = len(self._op_counts)
+        self._op_codes[op_type] = code
+        self._op_counts.append(array("l", bytes(self._capacity * array("l").itemsize)))
+        self._op_costs.append(array("d", bytes(self._capacity * array("d").itemsize)))
+        return code
+
+    def _grow(self, capacity):
+        """Extend every column to the new slot capacity"""
+        extra = capacity - self._capacity
+        for column in (self._usage, self._warning, self._hard_stop, self._start,
+                       self._last_active, self._warning_time, self._hard_stop_time):
+            column.extend(array("d", bytes(extra * column.itemsize)))
+        for column in self._op_counts:
+            column.extend(array("l", bytes(extra * column.itemsize)))
+        for column in self._op_costs:
+            column.extend(array("d", bytes(extra * column.itemsize)))
+        self._flags.extend(bytes(extra))
+        self._ids.extend([None] * extra)
+        # Pop from the end so low slots are reused first
+        self._free.extend(range(capacity - 1, self._capacity - 1, -1))
+        self._capacity = capacity
+
+
+class PooledSession:
+    """Lightweight handle to one pooled session"""
+
+    __slots__ = ("pool", "slot", "session_id")
+
+    def __init__(self, pool, slot, session_id):
+        self.pool = pool
+        self.slot = slot
+        self.session_id = session_id
+
+    def register(self, op_type, complexity=None, size=None):
+        return self.pool.register(self.session_id, op_type, complexity, size)
+
+    def estimate(self, task, complexity="medium", size="medium"):
+        return self.pool.estimate(self.session_id, task, complexity, size)
+
+    def check(self):
+        return self.pool.check([self.session_id])[self.session_id]
+
+    def close(self):
+        return self.pool.close(self.session_id)
+
+
+# Example usage
+if __name__ == "__main__":
+    pool = TrackerPool(idle_timeout=1800)
+
+    sessions = [pool.open() for _ in range(3)]
+    sessions[0].register("context", size=80)
+    sessions[0].register("code", "high", "large")
+    sessions[1].register("discuss", size=300)
+
+    for session_id, status in pool.check().items():
+        print(f"{session_id}: {status['usage']}% ({status['status']})")
+    print(pool.status_counts())
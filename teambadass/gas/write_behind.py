@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+FILE_OVERVIEW: write_behind.py - Background write-behind metrics flusher
+VERSION: 1.0.0
+LAST_UPDATED: 2025-05-03
+DEPENDENCIES: minimal_tracker.py, metrics_log.py
+IMPORTED_BY: None
+
+TABLE_OF_CONTENTS:
+1. WriteBehindFlusher Class - Background thread persisting dirty tracker state
+2. Triggers - Flush after an interval or after max_pending state changes
+3. Durability - none / fsync / atomic, applied to the tracker's metrics log
+4. Shutdown - stop() flushes remaining state; registered with atexit
+
+SKIP_DETAILED_ANALYSIS: True - This header provides sufficient context
+"""
+
+import atexit
+import logging
+import threading
+
+from metrics_log import DURABILITY_LEVELS
+
+logger = logging.getLogger("MinimalTracker")
+
+
+class WriteBehindFlusher:
+    """Batches tracker changes and saves them from a background thread"""
+
+    def __init__(self, tracker, interval=5.0, max_pending=50, durability=None):
+        """
+        Attach a flusher to a tracker
+
+        Args:
+            tracker (MinimalTracker): Tracker whose state is persisted
+            interval (float): Seconds between time-triggered flushes
+            max_pending (int): State changes that trigger an early flush
+            durability (str): Override for the log durability (none/fsync/atomic)
+        """
+        if durability is not None:
+            if durability not in DURABILITY_LEVELS:
+                raise ValueError(f"Unknown durability: {durability}")
+            tracker.metrics_log.durability = durability
+
+        self.tracker = tracker
+        self.interval = interval
+        self.max_pending = max_pending
+        self.flushed_version = tracker.version
+        self.flush_count = 0
+        self.last_error = None
+
+        self._wake = threading.Event()
+        self._stopping = False
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._previous_on_change = None
+
+    def start(self):
+        """Start the background thread and hook tracker changes"""
+        if self._thread is not None:
+            return self
+        # Chain to any listener already attached instead of replacing it
+        self._previous_on_change = self.tracker.on_change
+        self.tracker.on_change = self._on_change
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="tracker-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self, flush=True):
+        """
+        Stop the background thread
+
+        Args:
+            flush (bool): Persist any unflushed state before returning
+
+        Returns:
+            dict: Result of the final flush (or None)
+        """
+        if self._thread is not None:
+            self._stopping = True
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+            atexit.unregister(self.stop)
+        if self.tracker.on_change == self._on_change:
+            self.tracker.on_change = self._previous_on_change
+        self._previous_on_change = None
+        return self.flush() if flush else None
+
+    def flush(self):
+        """
+        Persist tracker state if it changed since the last flush
+
+        Returns:
+            dict: save result, or None if there was nothing to write
+        """
+        with self._flush_lock:
+            version = self.tracker.version
+            if version == self.flushed_version:
+                return None
+            try:
+                result = self.tracker._write_record(self.tracker._session_record())
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Write-behind flush failed: {e}")
+                return {"status": "error", "message": str(e)}
+            self.flushed_version = version
+            self.flush_count += 1
+            return result
+
+    @property
+    def pending(self):
+        """State changes not yet flushed"""
+        return self.tracker.version - self.flushed_version
+
+    def _on_change(self, tracker):
+        """Tracker change hook: only wakes the thread, never does I/O"""
+        if tracker.version - self.flushed_version >= self.max_pending:
+            self._wake.set()
+        if self._previous_on_change:
+            self._previous_on_change(tracker)
+
+    def _run(self):
+        """Flush on each interval or early wake-up until stopped"""
+        while not self._stopping:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._stopping:
+                self.flush()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()